@@ -68,6 +68,45 @@ async function activateTab(params = {}) {
   return { ok: true, result: { activated: true, tabId } };
 }
 
+async function runCommand(method, params = {}) {
+  if (method === "list_tabs") {
+    try {
+      return await listTabs(params);
+    } catch (e) {
+      return { ok: false, error: String(e && e.message ? e.message : e) };
+    }
+  }
+
+  if (method === "activate_tab") {
+    try {
+      return await activateTab(params);
+    } catch (e) {
+      return { ok: false, error: String(e && e.message ? e.message : e) };
+    }
+  }
+
+  return sendToActiveTab({
+    type: "browser_command",
+    method,
+    params,
+  });
+}
+
+async function runBatch(ops = []) {
+  // Run in order: later ops (e.g. click after type) may depend on earlier ones
+  const responses = [];
+  for (const op of ops) {
+    if (!op || !op.id || !op.method) continue;
+
+    const opResult = await runCommand(op.method, op.params || {});
+    const response = { id: op.id, ok: opResult.ok };
+    if (opResult.ok) response.result = opResult.result;
+    else response.error = opResult.error;
+    responses.push(response);
+  }
+  return responses;
+}
+
 function scheduleReconnect() {
   if (reconnectTimer) return;
   reconnectTimer = setTimeout(() => {
@@ -116,32 +155,24 @@ function connect() {
 
       if (!msg || !msg.id || !msg.method) return;
 
+      if (msg.method === "batch") {
+        const ops = (msg.params && msg.params.ops) || [];
+        const responses = await runBatch(ops);
+        try {
+          ws.send(JSON.stringify({ id: msg.id, type: "batch_response", responses }));
+        } catch {
+          // ignore
+        }
+        return;
+      }
+
       const response = {
         id: msg.id,
         type: "response",
         ok: false,
       };
 
-      let tabResult;
-      if (msg.method === "list_tabs") {
-        try {
-          tabResult = await listTabs(msg.params || {});
-        } catch (e) {
-          tabResult = { ok: false, error: String(e && e.message ? e.message : e) };
-        }
-      } else if (msg.method === "activate_tab") {
-        try {
-          tabResult = await activateTab(msg.params || {});
-        } catch (e) {
-          tabResult = { ok: false, error: String(e && e.message ? e.message : e) };
-        }
-      } else {
-        tabResult = await sendToActiveTab({
-          type: "browser_command",
-          method: msg.method,
-          params: msg.params || {},
-        });
-      }
+      const tabResult = await runCommand(msg.method, msg.params || {});
 
       response.ok = tabResult.ok;
       if (tabResult.ok) response.result = tabResult.result;
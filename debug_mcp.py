@@ -3,7 +3,14 @@ import sys
 sys.path.insert(0, 'src')
 
 import logging
-logging.basicConfig(level=logging.DEBUG, format='%(name)s: %(message)s')
+
+# Scope DEBUG to the package instead of the root logger, so third-party
+# libraries don't format (and emit) their own debug records.
+_handler = logging.StreamHandler()
+_handler.setFormatter(logging.Formatter('%(name)s: %(message)s'))
+_pkg_logger = logging.getLogger("mcp_desktop_visual")
+_pkg_logger.setLevel(logging.DEBUG)
+_pkg_logger.addHandler(_handler)
 
 from mcp_desktop_visual.engine import DesktopVisualEngine
 
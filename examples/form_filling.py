@@ -9,6 +9,10 @@ import time
 from mcp_desktop_visual.engine import DesktopVisualEngine
 
 
+# Candidate submit button labels, in order of preference
+SUBMIT_LABELS = ("Submit", "Sign Up", "Register", "OK", "Send")
+
+
 def fill_form(engine: DesktopVisualEngine, form_data: dict):
     """
     Fill a form with the given data.
@@ -76,14 +80,13 @@ def main():
         
         # Optionally submit
         print("\n🔘 Looking for submit button...")
-        for label in ["Submit", "Sign Up", "Register", "OK", "Send"]:
-            btn = engine.find_element_by_label(label)
-            if btn:
-                print(f"   Found: {label}")
-                # Uncomment to actually click
-                # result = engine.click(btn.id)
-                # print(f"   Clicked: {result.success}")
-                break
+        match = engine.find_element_by_any_label(SUBMIT_LABELS)
+        if match:
+            label, btn = match
+            print(f"   Found: {label}")
+            # Uncomment to actually click
+            # result = engine.click(btn.id)
+            # print(f"   Clicked: {result.success}")
         else:
             print("   No submit button found")
     
@@ -5,10 +5,16 @@ This example demonstrates how to monitor the screen for changes
 and react to specific UI elements appearing.
 """
 
+import queue
 import time
 from mcp_desktop_visual.engine import DesktopVisualEngine
 
 
+# Background capture: fast right after a change, backing off while idle
+MIN_INTERVAL = 0.1
+MAX_INTERVAL = 2.0
+
+
 def monitor_for_element(engine: DesktopVisualEngine, target_label: str, timeout: float = 30.0):
     """
     Monitor the screen and wait for a specific element to appear.
@@ -22,23 +28,32 @@ def monitor_for_element(engine: DesktopVisualEngine, target_label: str, timeout:
         The element if found, None if timeout
     """
     print(f"   Watching for '{target_label}'...")
-    start_time = time.time()
+    deadline = time.monotonic() + timeout
+    changes = engine.subscribe()
+    engine.start_monitoring(MIN_INTERVAL, MAX_INTERVAL)
     
-    while time.time() - start_time < timeout:
-        # Capture and analyze
-        diff = engine.capture_and_analyze()
+    try:
+        # The element may already be on screen
+        elem = engine.find_element_by_label(target_label)
         
-        if diff.has_changes:
+        while elem is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            
+            try:
+                diff = changes.get(timeout=remaining)
+            except queue.Empty:
+                break
+            
             print(f"   📸 Screen changed ({diff.total_added} added, {diff.total_removed} removed)")
             
             # Check if target appeared
             elem = engine.find_element_by_label(target_label)
-            if elem:
-                return elem
-        
-        time.sleep(0.5)
+    finally:
+        engine.unsubscribe(changes)
     
-    return None
+    return elem
 
 
 def monitor_changes(engine: DesktopVisualEngine, duration: float = 10.0):
@@ -50,13 +65,23 @@ def monitor_changes(engine: DesktopVisualEngine, duration: float = 10.0):
         duration: How long to monitor in seconds
     """
     print(f"   Monitoring for {duration} seconds...")
-    start_time = time.time()
+    deadline = time.monotonic() + duration
     change_count = 0
+    changes = engine.subscribe()
+    engine.start_monitoring(MIN_INTERVAL, MAX_INTERVAL)
     
-    while time.time() - start_time < duration:
-        diff = engine.capture_and_analyze()
-        
-        if diff.has_changes:
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            
+            # Block until the monitor thread reports a change
+            try:
+                diff = changes.get(timeout=remaining)
+            except queue.Empty:
+                break
+            
             change_count += 1
             print(f"\n   Change #{change_count}:")
             
@@ -68,8 +93,8 @@ def monitor_changes(engine: DesktopVisualEngine, duration: float = 10.0):
                 
                 for elem in region.removed_elements:
                     print(f"         - Removed: {elem.type.value} - {elem.label or elem.text or '(no text)'}")
-        
-        time.sleep(0.5)
+    finally:
+        engine.unsubscribe(changes)
     
     print(f"\n   Total changes: {change_count}")
 
@@ -7,25 +7,33 @@ Protocol (JSON):
 - Extension -> Server:
   - {"type":"hello", ...}
   - {"type":"response","id":...,"ok":true,"result":...}
+  - {"type":"batch_response","id":...,"responses":[{"id":...,"ok":true,"result":...}, ...]}
 - Server -> Extension:
   - {"id":...,"method":"get_state"|"navigate"|"click"|"type"|"query","params":{...}}
+  - {"id":...,"method":"batch","params":{"ops":[{"id":...,"method":...,"params":{...}}, ...]}}
 """
 
 from __future__ import annotations
 
 import asyncio
-import json
+import itertools
 import time
-import uuid
 from dataclasses import dataclass
 from typing import Any, Optional
 
+import orjson
 import websockets
 from websockets.server import WebSocketServerProtocol
 
+_monotonic = time.monotonic
+
+# Minimum interval between last_seen updates for a client (seconds)
+_LAST_SEEN_RESOLUTION = 0.05
+
 
 @dataclass
 class BrowserClientInfo:
+    # Monotonic clock readings; see BrowserBridge._to_wall_time
     connected_at: float
     last_seen: float
     user_agent: Optional[str] = None
@@ -40,13 +48,28 @@ class BrowserBridge:
 
         self._server = None
         self._clients: dict[WebSocketServerProtocol, BrowserClientInfo] = {}
-        self._pending: dict[str, asyncio.Future] = {}
-        self._lock = asyncio.Lock()
+        # Most recently seen client, kept up to date by _handler
+        self._mru_ws: Optional[WebSocketServerProtocol] = None
+        # Only touched from the event loop thread, and each set/get/pop is a
+        # single atomic dict operation under the GIL, so no lock is needed
+        # around registration/resolution. Concurrent ws.send() calls don't
+        # need one either: websockets serializes writes per connection.
+        self._pending: dict[int, asyncio.Future] = {}
+        # Request ids only need to be unique within this process
+        self._next_id = itertools.count(1).__next__
+        # Pre-encoded frames for param-less methods, with a %d id slot
+        self._payload_templates: dict[str, str] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Reference point for converting monotonic timestamps to wall-clock
+        self._base_wall = time.time()
+        self._base_mono = _monotonic()
 
     async def start(self) -> None:
         if self._server is not None:
             return
 
+        self._loop = asyncio.get_running_loop()
         self._server = await websockets.serve(self._handler, self.host, self.port)
 
     async def stop(self) -> None:
@@ -56,19 +79,23 @@ class BrowserBridge:
         await self._server.wait_closed()
         self._server = None
 
-        async with self._lock:
-            for fut in self._pending.values():
-                if not fut.done():
-                    fut.cancel()
-            self._pending.clear()
+        # Snapshot first: cancelled commands pop themselves from _pending
+        pending = list(self._pending.values())
+        self._pending.clear()
+        for fut in pending:
+            if not fut.done():
+                fut.cancel()
+
+    def _to_wall_time(self, mono: float) -> float:
+        return self._base_wall + (mono - self._base_mono)
 
     def status(self) -> dict[str, Any]:
         clients = []
         for info in self._clients.values():
             clients.append(
                 {
-                    "connected_at": info.connected_at,
-                    "last_seen": info.last_seen,
+                    "connected_at": self._to_wall_time(info.connected_at),
+                    "last_seen": self._to_wall_time(info.last_seen),
                     "name": info.name,
                     "version": info.version,
                     "user_agent": info.user_agent,
@@ -84,22 +111,24 @@ class BrowserBridge:
         }
 
     async def command(self, method: str, params: Optional[dict[str, Any]] = None, timeout: float = 10.0) -> dict[str, Any]:
-        if not self._clients:
-            return {"ok": False, "error": "No extension clients connected"}
-
         # Pick the most recently seen client
-        ws = max(self._clients.items(), key=lambda kv: kv[1].last_seen)[0]
-
-        request_id = str(uuid.uuid4())
-        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        ws = self._mru_ws or next(iter(self._clients), None)
+        if ws is None:
+            return {"ok": False, "error": "No extension clients connected"}
 
-        async with self._lock:
-            self._pending[request_id] = fut
+        request_id = self._next_id()
+        loop = self._loop or asyncio.get_running_loop()
+        fut: asyncio.Future = loop.create_future()
+        self._pending[request_id] = fut
 
-        payload = {"id": request_id, "method": method, "params": params or {}}
+        if params:
+            # Decode so the frame is sent as text (the extension JSON.parses it)
+            frame = orjson.dumps({"id": request_id, "method": method, "params": params}).decode()
+        else:
+            frame = self._payload_template(method) % request_id
 
         try:
-            await ws.send(json.dumps(payload))
+            await ws.send(frame)
             result = await asyncio.wait_for(fut, timeout=timeout)
             return result
         except asyncio.TimeoutError:
@@ -107,19 +136,93 @@ class BrowserBridge:
         except Exception as e:
             return {"ok": False, "error": str(e)}
         finally:
-            async with self._lock:
-                self._pending.pop(request_id, None)
+            self._pending.pop(request_id, None)
+
+    async def command_many(
+        self, ops: list[dict[str, Any]], timeout: float = 10.0
+    ) -> list[dict[str, Any]]:
+        """Send several commands in one frame and wait for all of their results.
+
+        Each op is {"method": ..., "params": {...}}. The extension runs the ops
+        in order and answers with a single batch_response frame, so N commands
+        cost one round-trip. Results are returned in the same order as ops.
+        """
+        if not ops:
+            return []
+
+        ws = self._mru_ws or next(iter(self._clients), None)
+        if ws is None:
+            return [{"ok": False, "error": "No extension clients connected"} for _ in ops]
+
+        loop = self._loop or asyncio.get_running_loop()
+        sub_ids = [self._next_id() for _ in ops]
+        futs: list[asyncio.Future] = []
+        for sub_id in sub_ids:
+            fut = loop.create_future()
+            self._pending[sub_id] = fut
+            futs.append(fut)
+
+        payload = {
+            "id": self._next_id(),
+            "method": "batch",
+            "params": {
+                "ops": [
+                    {"id": sub_id, "method": op.get("method"), "params": op.get("params") or {}}
+                    for sub_id, op in zip(sub_ids, ops)
+                ]
+            },
+        }
+
+        try:
+            await ws.send(orjson.dumps(payload).decode())
+            await asyncio.wait(futs, timeout=timeout)
+        except Exception as e:
+            return [{"ok": False, "error": str(e)} for _ in ops]
+        finally:
+            for sub_id in sub_ids:
+                self._pending.pop(sub_id, None)
+
+        return [
+            fut.result()
+            if fut.done() and not fut.cancelled()
+            else {"ok": False, "error": "Timeout waiting for extension response"}
+            for fut in futs
+        ]
+
+    def _payload_template(self, method: str) -> str:
+        template = self._payload_templates.get(method)
+        if template is None:
+            encoded_method = orjson.dumps(method).decode().replace("%", "%%")
+            template = '{"id":%d,"method":' + encoded_method + ',"params":{}}'
+            self._payload_templates[method] = template
+        return template
+
+    def _resolve(self, msg: dict[str, Any]) -> None:
+        fut = self._pending.get(msg.get("id"))
+        if fut and not fut.done():
+            fut.set_result(
+                {
+                    "ok": bool(msg.get("ok")),
+                    "result": msg.get("result"),
+                    "error": msg.get("error"),
+                }
+            )
 
     async def _handler(self, ws: WebSocketServerProtocol) -> None:
-        info = BrowserClientInfo(connected_at=time.time(), last_seen=time.time())
+        now = _monotonic()
+        info = BrowserClientInfo(connected_at=now, last_seen=now)
         self._clients[ws] = info
+        self._mru_ws = ws
 
         try:
             async for message in ws:
-                info.last_seen = time.time()
+                now = _monotonic()
+                if now - info.last_seen > _LAST_SEEN_RESOLUTION:
+                    info.last_seen = now
+                self._mru_ws = ws
 
                 try:
-                    msg = json.loads(message)
+                    msg = orjson.loads(message)
                 except Exception:
                     continue
 
@@ -133,16 +236,17 @@ class BrowserBridge:
                     continue
 
                 if msg.get("type") == "response" and msg.get("id"):
-                    req_id = msg.get("id")
-                    async with self._lock:
-                        fut = self._pending.get(req_id)
-                    if fut and not fut.done():
-                        fut.set_result(
-                            {
-                                "ok": bool(msg.get("ok")),
-                                "result": msg.get("result"),
-                                "error": msg.get("error"),
-                            }
-                        )
+                    self._resolve(msg)
+                    continue
+
+                if msg.get("type") == "batch_response":
+                    for response in msg.get("responses") or []:
+                        if isinstance(response, dict) and response.get("id"):
+                            self._resolve(response)
         finally:
             self._clients.pop(ws, None)
+            if self._mru_ws is ws:
+                # Fall back to the most recently seen remaining client
+                self._mru_ws = max(
+                    self._clients, key=lambda w: self._clients[w].last_seen, default=None
+                )
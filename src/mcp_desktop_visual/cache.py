@@ -5,18 +5,214 @@ Maintains a persistent cache of the visual state, enabling
 incremental updates and efficient element lookups.
 """
 
-import time
-from collections import deque
+import copy
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
-from rapidfuzz import fuzz
+from functools import lru_cache
+from itertools import chain, islice, repeat
+from operator import attrgetter
+from typing import Collection, Iterable, Optional, Sequence
+
+import numpy as np
+from rapidfuzz import fuzz, process
 
 from .config import get_config, CacheConfig
 from .models import (
     UIElement, WindowInfo, ScreenState, VisualDiff,
     ChangedRegion, ChangeType, BoundingBox, ElementType
 )
+from .spatial import QuadTree, overlap_groups
+
+
+def _label_key(label: str) -> str:
+    """Normalize a label for index lookups (case and whitespace insensitive)."""
+    return " ".join(label.split()).casefold()
+
+
+# Query labels are usually a small set of literals ("Submit", "Username", ...)
+# asked for over and over, so their keys are memoized instead of re-normalized
+# on every lookup. Element labels are keyed once at insertion and not cached here.
+_query_key = lru_cache(maxsize=256)(_label_key)
+
+# Fields compared by _content_changed, fetched as one tuple in C
+_content_signature = attrgetter("label", "text", "is_enabled", "is_visible", "is_focused")
+
+# Sort key for changed regions: top to bottom, then left to right
+_region_order = attrgetter("bounds.y", "bounds.x")
+
+# Number of least-recently-used elements dropped at once when the cache is full
+_EVICT_BATCH = 64
+
+
+@dataclass
+class ElementColumns:
+    """
+    Column-oriented (struct-of-arrays) snapshot of the cached elements.
+    
+    Scans that only read a few fields walk these compact parallel
+    columns instead of touching every UIElement object.
+    """
+    
+    ids: list[str]
+    labels: list[str]  # Normalized label keys ("" when unlabeled)
+    window_titles: list[str]  # Lowercased window titles ("" when unknown)
+    bounds: np.ndarray  # (N, 4) int32 rows of (x, y, x2, y2)
+    rows: dict[str, int] = field(default_factory=dict)  # id -> row index
+    # (label key, threshold) -> best fuzzy row (-1 for no match). Columns
+    # are rebuilt whenever the elements change, which drops these too
+    fuzzy_matches: dict[tuple[str, int], int] = field(default_factory=dict)
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    @classmethod
+    def from_elements(cls, elements: Iterable[UIElement]) -> "ElementColumns":
+        """Build the columns from a sequence of elements."""
+        ids: list[str] = []
+        labels: list[str] = []
+        window_titles: list[str] = []
+        rows: list[tuple[int, int, int, int]] = []
+        
+        for elem in elements:
+            b = elem.bounds
+            ids.append(elem.id)
+            labels.append(_label_key(elem.label) if elem.label else "")
+            window_titles.append(elem.window_title.lower() if elem.window_title else "")
+            rows.append((b.x, b.y, b.x + b.width, b.y + b.height))
+        
+        bounds = np.array(rows, dtype=np.int32).reshape(-1, 4)
+        return cls(
+            ids=ids,
+            labels=labels,
+            window_titles=window_titles,
+            bounds=bounds,
+            rows={id: i for i, id in enumerate(ids)},
+        )
+
+
+@dataclass
+class _HistoryEntry:
+    """
+    A past cache state, kept by reference.
+    
+    Holds the element and window tables that were live at the time;
+    a ScreenState is only built when the entry is actually read.
+    """
+    
+    timestamp: datetime
+    elements: dict[str, UIElement]
+    windows: dict[int, WindowInfo]
+    active_window: Optional[str]
+    screen_size: tuple[int, int]
+    
+    def to_state(self) -> ScreenState:
+        """Materialize the entry as a ScreenState."""
+        return ScreenState(
+            timestamp=self.timestamp,
+            elements=list(self.elements.values()),
+            windows=list(self.windows.values()),
+            active_window=self.active_window,
+            screen_size=self.screen_size,
+        )
+
+
+@dataclass(eq=False)
+class _Snapshot:
+    """
+    The element and window tables plus all of their indexes.
+    
+    Updates fill a new snapshot off to the side and publish it with
+    one attribute store, so a reader that grabs the cache's snapshot
+    once sees a consistent set of tables for its whole call. A published
+    snapshot is never edited again, apart from the recency table and the
+    lazily built views.
+    """
+    
+    # Elements in insertion order, which is the order queries return
+    elements: dict[str, UIElement]
+    # Buckets are insertion-ordered dicts used as sets, so removal is O(1)
+    # and the first-added match stays first. The outer dicts are plain
+    # dicts (buckets are created by bucket()) because dict.copy clones
+    # the hash table in one step where defaultdict.copy re-inserts keys
+    by_label: dict[str, dict[str, None]]
+    # Type-partitioned views: id -> element, in insertion order. Keyed by
+    # ElementType.value: Enum.__hash__ is a Python-level method, while
+    # str hashes are computed in C and cached on the string
+    by_type: dict[str, dict[str, UIElement]]
+    by_window: dict[str, dict[str, None]]
+    spatial: QuadTree
+    windows: dict[int, WindowInfo]
+    # Lowercased titles parallel to windows.values(), for title matching
+    window_titles: list[str]
+    # Element IDs in LRU order (least recently used first). Only eviction
+    # reads it; lookups touch it without the write lock (see _touch). It
+    # is a usage hint rather than part of the tables, so forks share it
+    recency: OrderedDict[str, None] = field(default_factory=OrderedDict)
+    # Derived views, built lazily and dropped on any element change
+    columns: Optional[ElementColumns] = None
+    type_counts: Optional[dict[str, int]] = None
+    # Set by fork(): (index id, key) of the buckets copied from the parent
+    # so far. None means the snapshot owns every bucket
+    owned_buckets: Optional[set[tuple[int, str]]] = None
+    
+    @classmethod
+    def empty(cls, screen_size: tuple[int, int]) -> "_Snapshot":
+        """Create empty tables for a screen of the given size."""
+        return cls(
+            elements={},
+            by_label={},
+            by_type={},
+            by_window={},
+            spatial=QuadTree(BoundingBox(0, 0, *screen_size)),
+            windows={},
+            window_titles=[],
+        )
+    
+    def fork(self) -> "_Snapshot":
+        """
+        Start a successor snapshot that can be edited without touching this one.
+        
+        The element table and the outer index dicts are copied; index
+        buckets and quadtree nodes stay shared until the successor first
+        writes to them (see bucket()). The recency table is shared.
+        """
+        return _Snapshot(
+            elements=self.elements.copy(),
+            by_label=self.by_label.copy(),
+            by_type=self.by_type.copy(),
+            by_window=self.by_window.copy(),
+            spatial=self.spatial.copy(),
+            windows=self.windows,
+            window_titles=self.window_titles,
+            recency=self.recency,
+            owned_buckets=set(),
+        )
+    
+    def bucket(self, index: dict[str, dict], key: str) -> dict:
+        """
+        Get a bucket of one of this snapshot's indexes for writing.
+        
+        Creates the bucket if missing, and copies it first if it is
+        still shared with the snapshot this one was forked from.
+        """
+        bucket = index.get(key)
+        owned = self.owned_buckets
+        if bucket is None:
+            bucket = index[key] = {}
+        elif owned is None or (id(index), key) in owned:
+            return bucket
+        else:
+            bucket = index[key] = bucket.copy()
+        if owned is not None:
+            owned.add((id(index), key))
+        return bucket
+    
+    def set_windows(self, windows: Iterable[WindowInfo]) -> None:
+        """Replace the window table and its title column."""
+        self.windows = {w.handle: w for w in windows}
+        self.window_titles = [w.title.lower() for w in self.windows.values()]
 
 
 @dataclass
@@ -50,25 +246,29 @@ class VisualStateCache:
     Acts like a "Virtual DOM" for the desktop, tracking all visible
     elements and their positions. Supports incremental updates and
     efficient lookups.
+    
+    Reads are lock-free: every query grabs the current _Snapshot once
+    and works from it, and updates publish a new snapshot with a single
+    attribute store (update_full builds one from scratch,
+    update_incremental forks the current one). Writers are serialized
+    by a lock.
     """
     
     def __init__(self, config: Optional[CacheConfig] = None):
         self.config = config or get_config().cache
         
         # Current state
-        self._elements: dict[str, UIElement] = {}
-        self._windows: dict[int, WindowInfo] = {}
-        self._active_window: Optional[str] = None
         self._screen_size: tuple[int, int] = (1920, 1080)
+        self._snap = _Snapshot.empty(self._screen_size)
+        self._active_window: Optional[str] = None
         self._last_update: Optional[datetime] = None
+        self._write_lock = threading.Lock()
         
-        # Indexes for fast lookups
-        self._elements_by_label: dict[str, list[str]] = {}
-        self._elements_by_type: dict[ElementType, list[str]] = {}
-        self._elements_by_window: dict[str, list[str]] = {}
-        
-        # History for undo/comparison
-        self._history: deque[ScreenState] = deque(maxlen=self.config.max_history)
+        # History for undo/comparison: fixed-size ring buffer, where
+        # _history_head counts every push and the oldest slot is overwritten
+        self._history_size = max(self.config.max_history, 0)
+        self._history: list[Optional[_HistoryEntry]] = [None] * self._history_size
+        self._history_head = 0
         
         # Statistics
         self._updates_count = 0
@@ -78,21 +278,84 @@ class VisualStateCache:
     @property
     def current_state(self) -> ScreenState:
         """Get the current screen state."""
+        snap = self._snap
         return ScreenState(
             timestamp=self._last_update or datetime.now(),
-            elements=list(self._elements.values()),
-            windows=list(self._windows.values()),
+            elements=list(snap.elements.values()),
+            windows=list(snap.windows.values()),
             active_window=self._active_window,
             screen_size=self._screen_size,
         )
     
+    @property
+    def _history_len(self) -> int:
+        """Number of filled history slots."""
+        return min(self._history_head, self._history_size)
+    
+    def get_history(self) -> list[ScreenState]:
+        """Get past states, oldest first."""
+        if self._history_head <= self._history_size:
+            entries = self._history[:self._history_head]
+        else:
+            split = self._history_head % self._history_size
+            entries = self._history[split:] + self._history[:split]
+        return [entry.to_state() for entry in entries]
+    
+    def get_previous_state(self, steps_back: int = 1) -> Optional[ScreenState]:
+        """
+        Get a past state.
+        
+        Args:
+            steps_back: 1 for the state before the last update, 2 for the
+                one before that, and so on
+        
+        Returns:
+            The state, or None if history does not go back that far
+        """
+        if steps_back < 1 or steps_back > self._history_len:
+            return None
+        entry = self._history[(self._history_head - steps_back) % self._history_size]
+        return entry.to_state()
+    
+    def _push_history(
+        self,
+        elements: dict[str, UIElement],
+        windows: dict[int, WindowInfo]
+    ) -> None:
+        """Record the current state, sharing the given tables."""
+        if not self._history_size:
+            return
+        self._history[self._history_head % self._history_size] = _HistoryEntry(
+            timestamp=self._last_update or datetime.now(),
+            elements=elements,
+            windows=windows,
+            active_window=self._active_window,
+            screen_size=self._screen_size,
+        )
+        self._history_head += 1
+    
+    @property
+    def columns(self) -> ElementColumns:
+        """Get a columnar snapshot of the cached elements (built lazily)."""
+        return self._columns_of(self._snap)
+    
+    @staticmethod
+    def _columns_of(snap: "_Snapshot") -> ElementColumns:
+        """Get (building if needed) the columns of a snapshot."""
+        cols = snap.columns
+        if cols is None:
+            cols = ElementColumns.from_elements(list(snap.elements.values()))
+            snap.columns = cols
+        return cols
+    
     @property
     def stats(self) -> CacheStats:
         """Get cache statistics."""
+        snap = self._snap
         return CacheStats(
-            total_elements=len(self._elements),
-            total_windows=len(self._windows),
-            history_size=len(self._history),
+            total_elements=len(snap.elements),
+            total_windows=len(snap.windows),
+            history_size=self._history_len,
             last_update=self._last_update,
             updates_count=self._updates_count,
             cache_hits=self._cache_hits,
@@ -106,27 +369,43 @@ class VisualStateCache:
         Compares the new state with the current state and returns
         a diff of what changed.
         """
-        # Save current state to history
-        if self._elements:
-            self._history.append(self.current_state)
-        
-        # Compute diff
-        diff = self._compute_diff(state)
-        
-        # Clear and rebuild cache
-        self._elements.clear()
-        self._elements_by_label.clear()
-        self._elements_by_type.clear()
-        self._elements_by_window.clear()
-        
-        for element in state.elements:
-            self._add_element(element)
-        
-        self._windows = {w.handle: w for w in state.windows}
-        self._active_window = state.active_window
-        self._screen_size = state.screen_size
-        self._last_update = state.timestamp
-        self._updates_count += 1
+        with self._write_lock:
+            old = self._snap
+            
+            # Compute diff
+            diff = self._compute_diff(state, old)
+            
+            # Build the new tables off to the side. Only the newest
+            # max_elements fit, so the rest are never added (and nothing
+            # of this frame gets evicted)
+            elements = state.elements
+            limit = max(self.config.max_elements, 0)
+            if len(elements) > limit:
+                elements = elements[len(elements) - limit:]
+            new = _Snapshot.empty(state.screen_size)
+            for element in elements:
+                self._add_element(element, new)
+            new.set_windows(state.windows)
+            
+            # Elements that stay keep their recency; new ones are the most
+            # recent, in frame order
+            new.recency = OrderedDict.fromkeys(chain(
+                (id for id in list(old.recency) if id in new.elements), new.elements
+            ))
+            
+            # The old tables are never edited again, so history keeps them as-is
+            if old.elements:
+                self._push_history(old.elements, old.windows)
+            
+            # Publish
+            self._snap = new
+            self._screen_size = state.screen_size
+            self._active_window = state.active_window
+            self._last_update = state.timestamp
+            self._updates_count += 1
+            
+            if self.config.validate_indexes:
+                self._check_indexes(new)
         
         return diff
     
@@ -141,170 +420,214 @@ class VisualStateCache:
         
         Only processes the elements that changed.
         """
-        # Save current state to history
-        if self._elements:
-            self._history.append(self.current_state)
-        
-        changed_regions: list[ChangedRegion] = []
-        
-        # Process removals
-        for elem_id in removed:
-            if elem_id in self._elements:
-                elem = self._elements[elem_id]
-                changed_regions.append(ChangedRegion(
-                    bounds=elem.bounds,
-                    change_type=ChangeType.REMOVED,
-                    removed_elements=[elem],
-                ))
-                self._remove_element(elem_id)
-        
-        # Process additions
-        for elem in added:
-            self._add_element(elem)
-            changed_regions.append(ChangedRegion(
-                bounds=elem.bounds,
-                change_type=ChangeType.ADDED,
-                added_elements=[elem],
-            ))
+        # The returned diff carries a wall-clock timestamp, so this one
+        # clock read per update is needed anyway and doubles as _last_update
+        now = datetime.now()
         
-        # Process modifications
-        for elem in modified:
-            if elem.id in self._elements:
-                old_elem = self._elements[elem.id]
-                self._remove_element(elem.id)
-                self._add_element(elem)
-                changed_regions.append(ChangedRegion(
-                    bounds=elem.bounds.union(old_elem.bounds),
-                    change_type=ChangeType.MODIFIED,
-                    modified_elements=[elem],
-                ))
-            else:
-                # Treat as addition if not found
-                self._add_element(elem)
-                changed_regions.append(ChangedRegion(
-                    bounds=elem.bounds,
-                    change_type=ChangeType.ADDED,
-                    added_elements=[elem],
-                ))
-        
-        self._last_update = datetime.now()
-        self._updates_count += 1
+        with self._write_lock:
+            old = self._snap
+            snap = old.fork()
+            
+            # One pass over removals, additions and modifications (in that
+            # order), writing regions into a pre-sized list
+            changed_regions: list[Optional[ChangedRegion]] = [None] * (
+                len(removed) + len(added) + len(modified)
+            )
+            n = 0
+            # IDs added or replaced by this update, which eviction spares
+            fresh: set[str] = set()
+            ops = chain(
+                zip(repeat(ChangeType.REMOVED), removed),
+                zip(repeat(ChangeType.ADDED), added),
+                zip(repeat(ChangeType.MODIFIED), modified),
+            )
+            
+            for op, item in ops:
+                if op is ChangeType.REMOVED:
+                    elem = snap.elements.get(item)
+                    if elem is None:
+                        continue
+                    region = ChangedRegion(
+                        bounds=elem.bounds,
+                        change_type=ChangeType.REMOVED,
+                        removed_elements=[elem],
+                    )
+                    self._remove_element(item, snap)
+                else:
+                    old_elem = snap.elements.get(item.id) if op is ChangeType.MODIFIED else None
+                    self._add_element(item, snap, fresh)
+                    fresh.add(item.id)
+                    if old_elem is not None:
+                        region = ChangedRegion(
+                            bounds=item.bounds.union(old_elem.bounds),
+                            change_type=ChangeType.MODIFIED,
+                            modified_elements=[item],
+                        )
+                    else:
+                        # Modifications of unknown elements count as additions
+                        region = ChangedRegion(
+                            bounds=item.bounds,
+                            change_type=ChangeType.ADDED,
+                            added_elements=[item],
+                        )
+                
+                changed_regions[n] = region
+                n += 1
+            
+            del changed_regions[n:]
+            
+            # The old tables are never edited again, so history keeps them as-is
+            if old.elements:
+                self._push_history(old.elements, old.windows)
+            
+            # Publish
+            self._snap = snap
+            self._last_update = now
+            self._updates_count += 1
+            
+            if self.config.validate_indexes:
+                self._check_indexes(snap)
         
         # Merge overlapping regions
         changed_regions = self._merge_changed_regions(changed_regions)
         
         return VisualDiff(
-            timestamp=self._last_update,
+            timestamp=now,
             changed_regions=changed_regions,
             total_added=len(added),
             total_removed=len(removed),
             total_modified=len(modified),
         )
     
-    def _add_element(self, element: UIElement) -> None:
-        """Add an element to the cache."""
-        # Enforce max elements
-        if len(self._elements) >= self.config.max_elements:
-            # Remove oldest element (first added)
-            oldest_id = next(iter(self._elements))
-            self._remove_element(oldest_id)
+    def _add_element(
+        self,
+        element: UIElement,
+        snap: "_Snapshot",
+        fresh: Collection[str] = ()
+    ) -> None:
+        """
+        Add an element to a snapshot's tables.
+        
+        Args:
+            element: Element to add
+            snap: Snapshot to add it to
+            fresh: IDs already added by the same update; eviction takes
+                them only when that update alone overflows the cache
+        """
+        elements = snap.elements
+        
+        # Re-adding an ID replaces the old entry and its index slots
+        if element.id in elements:
+            self._remove_element(element.id, snap)
+        
+        # Enforce max elements, evicting least recently used. Entries that
+        # predate the update go in batches so the scan isn't repeated on
+        # every add; fresh ones only as far as needed to fit
+        if len(elements) >= self.config.max_elements:
+            overflow = len(elements) - self.config.max_elements + 1
+            # list() copies in one C call, so a concurrent touch can't
+            # reorder the recency table while we walk it
+            order = list(snap.recency)
+            victims = list(islice(
+                (id for id in order if id not in fresh), max(overflow, _EVICT_BATCH)
+            ))
+            if len(victims) < overflow:
+                victims.extend(islice(
+                    (id for id in order if id in fresh), overflow - len(victims)
+                ))
+            for id in victims:
+                self._remove_element(id, snap)
         
-        self._elements[element.id] = element
+        elements[element.id] = element
+        snap.recency[element.id] = None
+        snap.spatial.insert(element.id, element.bounds)
+        snap.columns = None
+        snap.type_counts = None
         
-        # Index by label
+        # Index by label, type and window (buckets are created on first use)
         if element.label:
-            label_lower = element.label.lower()
-            if label_lower not in self._elements_by_label:
-                self._elements_by_label[label_lower] = []
-            self._elements_by_label[label_lower].append(element.id)
+            snap.bucket(snap.by_label, _label_key(element.label))[element.id] = None
         
-        # Index by type
-        if element.type not in self._elements_by_type:
-            self._elements_by_type[element.type] = []
-        self._elements_by_type[element.type].append(element.id)
+        snap.bucket(snap.by_type, element.type.value)[element.id] = element
         
-        # Index by window
         if element.window_title:
-            if element.window_title not in self._elements_by_window:
-                self._elements_by_window[element.window_title] = []
-            self._elements_by_window[element.window_title].append(element.id)
+            snap.bucket(snap.by_window, element.window_title)[element.id] = None
     
-    def _remove_element(self, element_id: str) -> None:
-        """Remove an element from the cache."""
-        if element_id not in self._elements:
+    def _remove_element(self, element_id: str, snap: "_Snapshot") -> None:
+        """Remove an element from a snapshot's tables."""
+        element = snap.elements.get(element_id)
+        if element is None:
             return
         
-        element = self._elements[element_id]
-        
         # Remove from indexes
         if element.label:
-            label_lower = element.label.lower()
-            if label_lower in self._elements_by_label:
-                try:
-                    self._elements_by_label[label_lower].remove(element_id)
-                except ValueError:
-                    pass
-        
-        if element.type in self._elements_by_type:
-            try:
-                self._elements_by_type[element.type].remove(element_id)
-            except ValueError:
-                pass
-        
-        if element.window_title and element.window_title in self._elements_by_window:
-            try:
-                self._elements_by_window[element.window_title].remove(element_id)
-            except ValueError:
-                pass
-        
-        del self._elements[element_id]
-    
-    def _compute_diff(self, new_state: ScreenState) -> VisualDiff:
-        """Compute the difference between current state and new state."""
-        old_ids = set(self._elements.keys())
-        new_elements = {e.id: e for e in new_state.elements}
-        new_ids = set(new_elements.keys())
+            label_key = _label_key(element.label)
+            if label_key in snap.by_label:
+                bucket = snap.bucket(snap.by_label, label_key)
+                bucket.pop(element_id, None)
+                if not bucket:
+                    del snap.by_label[label_key]
         
-        added_ids = new_ids - old_ids
-        removed_ids = old_ids - new_ids
-        common_ids = old_ids & new_ids
+        if element.type.value in snap.by_type:
+            snap.bucket(snap.by_type, element.type.value).pop(element_id, None)
         
-        added = [new_elements[id] for id in added_ids]
-        removed = [self._elements[id] for id in removed_ids]
-        modified = []
+        if element.window_title:
+            if element.window_title in snap.by_window:
+                bucket = snap.bucket(snap.by_window, element.window_title)
+                bucket.pop(element_id, None)
+                if not bucket:
+                    del snap.by_window[element.window_title]
         
-        for id in common_ids:
-            old_elem = self._elements[id]
-            new_elem = new_elements[id]
-            if self._element_changed(old_elem, new_elem):
-                modified.append(new_elem)
+        snap.spatial.remove(element_id)
+        snap.columns = None
+        snap.type_counts = None
+        snap.recency.pop(element_id, None)
+        del snap.elements[element_id]
+    
+    def _compute_diff(self, new_state: ScreenState, snap: "_Snapshot") -> VisualDiff:
+        """Compute the difference between a snapshot and a new state."""
+        old_elements = snap.elements
+        new_elements = {e.id: e for e in new_state.elements}
+        old_keys = old_elements.keys()
+        new_keys = new_elements.keys()
         
         changed_regions: list[ChangedRegion] = []
+        total_added = total_removed = total_modified = 0
         
-        if added:
-            for elem in added:
-                changed_regions.append(ChangedRegion(
-                    bounds=elem.bounds,
-                    change_type=ChangeType.ADDED,
-                    added_elements=[elem],
-                ))
+        # Set ops straight on the key views; regions are emitted as we go
+        for id in new_keys - old_keys:
+            elem = new_elements[id]
+            changed_regions.append(ChangedRegion(
+                bounds=elem.bounds,
+                change_type=ChangeType.ADDED,
+                added_elements=[elem],
+            ))
+            total_added += 1
         
-        if removed:
-            for elem in removed:
-                changed_regions.append(ChangedRegion(
-                    bounds=elem.bounds,
-                    change_type=ChangeType.REMOVED,
-                    removed_elements=[elem],
-                ))
+        for id in old_keys - new_keys:
+            elem = old_elements[id]
+            changed_regions.append(ChangedRegion(
+                bounds=elem.bounds,
+                change_type=ChangeType.REMOVED,
+                removed_elements=[elem],
+            ))
+            total_removed += 1
+        
+        # Vectorized pre-filter: elements whose bounds moved are modified
+        # without running the per-element comparison
+        common_ids = list(old_keys & new_keys)
+        moved = self._bounds_moved(common_ids, new_elements, self._columns_of(snap))
         
-        if modified:
-            for elem in modified:
-                old_elem = self._elements[elem.id]
+        for id, was_moved in zip(common_ids, moved):
+            old_elem = old_elements[id]
+            new_elem = new_elements[id]
+            if was_moved or self._content_changed(old_elem, new_elem):
                 changed_regions.append(ChangedRegion(
-                    bounds=elem.bounds.union(old_elem.bounds),
+                    bounds=new_elem.bounds.union(old_elem.bounds),
                     change_type=ChangeType.MODIFIED,
-                    modified_elements=[elem],
+                    modified_elements=[new_elem],
                 ))
+                total_modified += 1
         
         # Merge overlapping regions
         changed_regions = self._merge_changed_regions(changed_regions)
@@ -312,33 +635,65 @@ class VisualStateCache:
         return VisualDiff(
             timestamp=new_state.timestamp,
             changed_regions=changed_regions,
-            total_added=len(added),
-            total_removed=len(removed),
-            total_modified=len(modified),
+            total_added=total_added,
+            total_removed=total_removed,
+            total_modified=total_modified,
         )
     
-    def _element_changed(self, old: UIElement, new: UIElement) -> bool:
-        """Check if an element has changed significantly."""
-        tolerance = self.config.position_tolerance
+    def _check_indexes(self, snap: "_Snapshot") -> None:
+        """
+        Verify that every index agrees with the element table.
         
-        # Check position change
-        if (abs(old.bounds.x - new.bounds.x) > tolerance or
-            abs(old.bounds.y - new.bounds.y) > tolerance or
-            abs(old.bounds.width - new.bounds.width) > tolerance or
-            abs(old.bounds.height - new.bounds.height) > tolerance):
-            return True
+        Lookups index into the element table without membership checks,
+        relying on _add_element/_remove_element to keep the indexes in
+        sync. Enable CacheConfig.validate_indexes to check that invariant
+        after updates.
         
-        # Check text/label change
-        if old.label != new.label or old.text != new.text:
-            return True
+        Raises:
+            AssertionError: If an index is out of sync
+        """
+        items = list(snap.elements.items())
+        label_ids = [id for bucket in snap.by_label.values() for id in bucket]
+        type_ids = [id for bucket in snap.by_type.values() for id in bucket]
+        window_ids = [id for bucket in snap.by_window.values() for id in bucket]
         
-        # Check state change
-        if (old.is_enabled != new.is_enabled or
-            old.is_visible != new.is_visible or
-            old.is_focused != new.is_focused):
-            return True
+        all_ids = {id for id, _ in items}
+        labeled = {id for id, e in items if e.label}
+        titled = {id for id, e in items if e.window_title}
         
-        return False
+        if len(label_ids) != len(labeled) or set(label_ids) != labeled:
+            raise AssertionError("label index out of sync with elements")
+        if len(type_ids) != len(all_ids) or set(type_ids) != all_ids:
+            raise AssertionError("type index out of sync with elements")
+        if len(window_ids) != len(titled) or set(window_ids) != titled:
+            raise AssertionError("window index out of sync with elements")
+        if len(snap.spatial) != len(all_ids):
+            raise AssertionError("spatial index out of sync with elements")
+        if len(snap.recency) != len(all_ids) or set(snap.recency) != all_ids:
+            raise AssertionError("recency table out of sync with elements")
+    
+    def _bounds_moved(
+        self,
+        element_ids: list[str],
+        new_elements: dict[str, UIElement],
+        cols: ElementColumns
+    ) -> np.ndarray:
+        """Check which elements moved or resized beyond the tolerance."""
+        if not element_ids:
+            return np.zeros(0, dtype=bool)
+        
+        old = cols.bounds[[cols.rows[id] for id in element_ids]]
+        new = ElementColumns.from_elements(new_elements[id] for id in element_ids).bounds
+        
+        # Compare (x, y, width, height) against the position tolerance
+        delta = new - old
+        delta[:, 2] -= delta[:, 0]
+        delta[:, 3] -= delta[:, 1]
+        return np.any(np.abs(delta) > self.config.position_tolerance, axis=1)
+    
+    def _content_changed(self, old: UIElement, new: UIElement) -> bool:
+        """Check if an element's text or state changed."""
+        return _content_signature(old) != _content_signature(new)
     
     def _merge_changed_regions(
         self,
@@ -348,35 +703,91 @@ class VisualStateCache:
         if len(regions) <= 1:
             return regions
         
-        # Sort by position
-        regions.sort(key=lambda r: (r.bounds.y, r.bounds.x))
+        # Fast path: if no region touches the running extent of the ones
+        # before it, nothing can overlap and only the ordering is needed
+        if not self._may_overlap(regions):
+            regions.sort(key=_region_order)
+            return regions
         
-        merged = []
-        current = regions[0]
+        # A merged box can reach regions its members did not overlap,
+        # so repeat until no two regions intersect
+        while True:
+            groups = overlap_groups([r.bounds for r in regions])
+            if len(groups) == len(regions):
+                break
+            
+            merged = []
+            for group in groups:
+                if len(group) == 1:
+                    merged.append(regions[group[0]])
+                    continue
+                
+                members = [regions[i] for i in group]
+                bounds = members[0].bounds
+                for region in members[1:]:
+                    bounds = bounds.union(region.bounds)
+                
+                merged.append(ChangedRegion(
+                    bounds=bounds,
+                    change_type=ChangeType.MODIFIED,
+                    added_elements=[e for r in members for e in r.added_elements],
+                    removed_elements=[e for r in members for e in r.removed_elements],
+                    modified_elements=[e for r in members for e in r.modified_elements],
+                ))
+            regions = merged
+        
+        regions.sort(key=_region_order)
+        return regions
+    
+    @staticmethod
+    def _may_overlap(regions: list[ChangedRegion]) -> bool:
+        """
+        Cheap conservative overlap test.
+        
+        Returns False only when no two regions can intersect; a True may
+        be a false positive (the extents touch but the boxes don't).
+        """
+        b = regions[0].bounds
+        min_x, min_y, max_x, max_y = b.x, b.y, b.x + b.width, b.y + b.height
         
         for region in regions[1:]:
-            if current.bounds.intersects(region.bounds):
-                # Merge regions
-                current = ChangedRegion(
-                    bounds=current.bounds.union(region.bounds),
-                    change_type=ChangeType.MODIFIED,
-                    added_elements=current.added_elements + region.added_elements,
-                    removed_elements=current.removed_elements + region.removed_elements,
-                    modified_elements=current.modified_elements + region.modified_elements,
-                )
-            else:
-                merged.append(current)
-                current = region
+            b = region.bounds
+            x, y = b.x, b.y
+            x2, y2 = x + b.width, y + b.height
+            if not (max_x < x or x2 < min_x or max_y < y or y2 < min_y):
+                return True
+            if x < min_x:
+                min_x = x
+            if y < min_y:
+                min_y = y
+            if x2 > max_x:
+                max_x = x2
+            if y2 > max_y:
+                max_y = y2
         
-        merged.append(current)
-        return merged
+        return False
     
     # ==================== Query Methods ====================
     
+    @staticmethod
+    def _touch(snap: "_Snapshot", element_id: str) -> None:
+        """
+        Mark an element as recently used, for eviction.
+        
+        Runs without the write lock, so the ID may already have been
+        evicted by a concurrent update; that touch is simply dropped.
+        """
+        try:
+            snap.recency.move_to_end(element_id)
+        except KeyError:
+            pass
+    
     def get_element_by_id(self, element_id: str) -> Optional[UIElement]:
         """Get an element by its ID."""
-        elem = self._elements.get(element_id)
+        snap = self._snap
+        elem = snap.elements.get(element_id)
         if elem:
+            self._touch(snap, element_id)
             self._cache_hits += 1
         else:
             self._cache_misses += 1
@@ -396,30 +807,97 @@ class VisualStateCache:
             fuzzy: Use fuzzy matching
             threshold: Minimum similarity score (0-100)
         """
-        label_lower = label.lower()
+        snap = self._snap
+        label_key = _query_key(label)
         
-        # Try exact match first
-        if label_lower in self._elements_by_label:
-            elem_ids = self._elements_by_label[label_lower]
-            if elem_ids:
+        # Try exact match first (O(1) index probe)
+        elem_ids = snap.by_label.get(label_key)
+        if elem_ids:
+            elem_id = next(iter(elem_ids))
+            elem = snap.elements.get(elem_id)
+            if elem is not None:
+                self._touch(snap, elem_id)
                 self._cache_hits += 1
-                return self._elements.get(elem_ids[0])
+                return elem
         
-        # Try fuzzy matching
+        # Try fuzzy matching (scored in C over the label column), memoized
+        # per columns snapshot since callers retry the same labels
         if fuzzy:
-            best_match = None
-            best_score = 0
-            
-            for elem in self._elements.values():
-                if elem.label:
-                    score = fuzz.ratio(label_lower, elem.label.lower())
-                    if score > best_score and score >= threshold:
-                        best_score = score
-                        best_match = elem
-            
-            if best_match:
+            cols = self._columns_of(snap)
+            row = cols.fuzzy_matches.get((label_key, threshold))
+            if row is None:
+                match = process.extractOne(
+                    label_key, cols.labels,
+                    scorer=fuzz.ratio, score_cutoff=threshold, processor=None
+                )
+                # Unlabeled rows are "" and can only score 0
+                row = match[2] if match is not None and match[1] > 0 else -1
+                cols.fuzzy_matches[(label_key, threshold)] = row
+            if row >= 0:
+                self._cache_hits += 1
+                return snap.elements[cols.ids[row]]
+        
+        self._cache_misses += 1
+        return None
+    
+    def query_elements_fuzzy(
+        self,
+        label: str,
+        threshold: int = 70,
+        limit: int = 50
+    ) -> list[tuple[UIElement, float]]:
+        """
+        Get the elements whose labels best match a query.
+        
+        All labels are scored in a single batched rapidfuzz call, and
+        only the top matches are selected and sorted.
+        
+        Args:
+            label: Label to search for
+            threshold: Minimum similarity score (0-100)
+            limit: Maximum results to return
+        
+        Returns:
+            (element, score) pairs, best match first
+        """
+        snap = self._snap
+        cols = self._columns_of(snap)
+        if not cols.labels or limit <= 0:
+            return []
+        
+        scores = process.cdist(
+            [_query_key(label)], cols.labels,
+            scorer=fuzz.ratio, score_cutoff=threshold, processor=None
+        )[0]
+        
+        # Scores under the cutoff come back as 0
+        hits = np.flatnonzero(scores)
+        if len(hits) > limit:
+            hits = hits[np.argpartition(-scores[hits], limit - 1)[:limit]]
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        
+        return [(snap.elements[cols.ids[i]], float(scores[i])) for i in hits]
+    
+    def get_element_by_any_label(
+        self,
+        labels: Sequence[str]
+    ) -> Optional[tuple[str, UIElement]]:
+        """
+        Get the first element matching any of the given labels.
+        
+        Labels are tried in order against the label index (exact,
+        case/whitespace-insensitive), so the first label that exists on
+        screen wins. No fuzzy matching is done.
+        
+        Returns:
+            (matched label, element) or None
+        """
+        snap = self._snap
+        for label in labels:
+            elem_ids = snap.by_label.get(_query_key(label))
+            if elem_ids:
                 self._cache_hits += 1
-                return best_match
+                return label, snap.elements[next(iter(elem_ids))]
         
         self._cache_misses += 1
         return None
@@ -442,29 +920,56 @@ class VisualStateCache:
             bounds: Filter by region (elements within bounds)
             limit: Maximum results to return
         """
+        snap = self._snap
         results: list[UIElement] = []
+        label_key = _query_key(label) if label is not None else None
+        check_bounds = bounds is not None
         
         # Start with type filter if specified (usually smallest set)
         if element_type is not None:
-            elem_ids = self._elements_by_type.get(element_type, [])
-            candidates = [self._elements[id] for id in elem_ids if id in self._elements]
+            type_bucket = snap.by_type.get(element_type.value)
+            candidates = list(type_bucket.values()) if type_bucket else []
+        elif bounds is not None:
+            # Same test as BoundingBox.intersects, as one mask over the
+            # bounds column; keeps cache order, unlike a quadtree walk
+            cols = self._columns_of(snap)
+            b = cols.bounds
+            hit = (
+                (b[:, 0] <= bounds.x2) & (bounds.x <= b[:, 2])
+                & (b[:, 1] <= bounds.y2) & (bounds.y <= b[:, 3])
+            )
+            candidates = [snap.elements[cols.ids[i]] for i in np.flatnonzero(hit).tolist()]
+            check_bounds = False
+        elif label_key is not None:
+            # Scan the label column and only touch matching elements
+            cols = self._columns_of(snap)
+            candidates = [
+                snap.elements[cols.ids[i]]
+                for i, elem_label in enumerate(cols.labels)
+                if label_key in elem_label
+            ]
         else:
-            candidates = list(self._elements.values())
+            candidates = list(snap.elements.values())
+        
+        title_lower = window_title.lower() if window_title is not None else None
+        if label_key is not None or title_lower is not None:
+            cols = self._columns_of(snap)
         
         for elem in candidates:
             if len(results) >= limit:
                 break
             
             # Apply filters
-            if label is not None:
-                if not elem.label or label.lower() not in elem.label.lower():
+            if label_key is not None:
+                # Compare against the key computed at insertion time
+                if not elem.label or label_key not in cols.labels[cols.rows[elem.id]]:
                     continue
             
-            if window_title is not None:
-                if not elem.window_title or window_title.lower() not in elem.window_title.lower():
+            if title_lower is not None:
+                if not elem.window_title or title_lower not in cols.window_titles[cols.rows[elem.id]]:
                     continue
             
-            if bounds is not None:
+            if check_bounds:
                 if not bounds.intersects(elem.bounds):
                     continue
             
@@ -474,23 +979,48 @@ class VisualStateCache:
     
     def get_element_at(self, x: int, y: int) -> Optional[UIElement]:
         """Get the element at a specific position."""
-        matching = [
-            elem for elem in self._elements.values()
-            if elem.bounds.contains(x, y)
-        ]
+        snap = self._snap
         
-        if not matching:
+        # Smallest element containing the point is the most specific
+        elem_id = snap.spatial.query_point_smallest(x, y)
+        
+        if elem_id is None:
             self._cache_misses += 1
             return None
         
-        # Return smallest element (most specific)
         self._cache_hits += 1
-        return min(matching, key=lambda e: e.bounds.area)
+        return snap.elements[elem_id]
     
     def get_elements_by_type(self, element_type: ElementType) -> list[UIElement]:
         """Get all elements of a specific type."""
-        elem_ids = self._elements_by_type.get(element_type, [])
-        return [self._elements[id] for id in elem_ids if id in self._elements]
+        type_bucket = self._snap.by_type.get(element_type.value)
+        return list(type_bucket.values()) if type_bucket else []
+    
+    def get_elements_outside(self, boxes: np.ndarray) -> list[UIElement]:
+        """
+        Get the elements that don't intersect any of the given regions.
+        
+        Same test as BoundingBox.intersects (touching edges count), done
+        for every element against every region in one broadcast over the
+        bounds column.
+        
+        Args:
+            boxes: (R, 4) array of (x, y, x2, y2) regions
+        
+        Returns:
+            Elements in cache order
+        """
+        snap = self._snap
+        cols = self._columns_of(snap)
+        
+        e = cols.bounds[:, None, :]
+        r = np.asarray(boxes)[None, :, :]
+        hit = (
+            (e[..., 0] <= r[..., 2]) & (r[..., 0] <= e[..., 2])
+            & (e[..., 1] <= r[..., 3]) & (r[..., 1] <= e[..., 3])
+        ).any(axis=1)
+        
+        return [snap.elements[cols.ids[i]] for i in np.flatnonzero(~hit).tolist()]
     
     def get_all_buttons(self) -> list[UIElement]:
         """Get all button elements."""
@@ -508,13 +1038,17 @@ class VisualStateCache:
     
     def update_windows(self, windows: list[WindowInfo]) -> None:
         """Update the window list."""
-        self._windows = {w.handle: w for w in windows}
-        
-        # Update active window
-        for window in windows:
-            if window.is_active:
-                self._active_window = window.title
-                break
+        with self._write_lock:
+            # Publish a copy sharing the element tables, with new windows
+            snap = copy.copy(self._snap)
+            snap.set_windows(windows)
+            self._snap = snap
+            
+            # Update active window
+            for window in windows:
+                if window.is_active:
+                    self._active_window = window.title
+                    break
     
     def get_window_by_title(
         self,
@@ -522,33 +1056,31 @@ class VisualStateCache:
         fuzzy: bool = True
     ) -> Optional[WindowInfo]:
         """Find a window by title."""
+        snap = self._snap
         title_lower = title.lower()
+        windows = list(snap.windows.values())
         
-        for window in self._windows.values():
-            if title_lower in window.title.lower():
-                return window
+        for i, window_title in enumerate(snap.window_titles):
+            if title_lower in window_title:
+                return windows[i]
         
         if fuzzy:
-            best_match = None
-            best_score = 0
-            
-            for window in self._windows.values():
-                score = fuzz.ratio(title_lower, window.title.lower())
-                if score > best_score and score >= 60:
-                    best_score = score
-                    best_match = window
-            
-            return best_match
+            match = process.extractOne(
+                title_lower, snap.window_titles,
+                scorer=fuzz.ratio, score_cutoff=60, processor=None
+            )
+            if match is not None and match[1] > 0:
+                return windows[match[2]]
         
         return None
     
     def get_all_windows(self) -> list[WindowInfo]:
         """Get all windows."""
-        return list(self._windows.values())
+        return list(self._snap.windows.values())
     
     def get_active_window(self) -> Optional[WindowInfo]:
         """Get the active window."""
-        for window in self._windows.values():
+        for window in self._snap.windows.values():
             if window.is_active:
                 return window
         return None
@@ -557,39 +1089,41 @@ class VisualStateCache:
     
     def clear(self) -> None:
         """Clear all cached data."""
-        self._elements.clear()
-        self._windows.clear()
-        self._elements_by_label.clear()
-        self._elements_by_type.clear()
-        self._elements_by_window.clear()
-        self._history.clear()
-        self._active_window = None
-        self._last_update = None
+        with self._write_lock:
+            self._snap = _Snapshot.empty(self._screen_size)
+            self._history = [None] * self._history_size
+            self._history_head = 0
+            self._active_window = None
+            self._last_update = None
     
     def get_summary(self) -> dict:
         """Get a summary of the current state."""
-        type_counts = {}
-        for elem_type, elem_ids in self._elements_by_type.items():
-            type_counts[elem_type.value] = len(elem_ids)
+        snap = self._snap
+        
+        # Counts only change when elements are added or removed, so
+        # repeated polling reuses them until the next mutation
+        type_counts = snap.type_counts
+        if type_counts is None:
+            type_counts = {
+                type_value: len(type_bucket)
+                for type_value, type_bucket in snap.by_type.items()
+            }
+            snap.type_counts = type_counts
         
         return {
             "timestamp": self._last_update.isoformat() if self._last_update else None,
             "screen_size": list(self._screen_size),
-            "total_elements": len(self._elements),
-            "total_windows": len(self._windows),
+            "total_elements": len(snap.elements),
+            "total_windows": len(snap.windows),
             "active_window": self._active_window,
-            "elements_by_type": type_counts,
+            "elements_by_type": dict(type_counts),
             "stats": self.stats.to_dict(),
         }
 
 
-# Global cache instance
-_cache: Optional[VisualStateCache] = None
-
-
+# Global cache instance. lru_cache(maxsize=None) memoizes the zero-argument
+# call, so after the first call this is a C-level lookup with no Python branch.
+@lru_cache(maxsize=None)
 def get_visual_cache() -> VisualStateCache:
     """Get the global visual state cache instance."""
-    global _cache
-    if _cache is None:
-        _cache = VisualStateCache()
-    return _cache
+    return VisualStateCache()
@@ -10,13 +10,15 @@ in `browser_extension/`.
 
 from __future__ import annotations
 
+import ctypes
 import os
 import subprocess
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True, frozen=True)
 class ChromeOpenResult:
     already_running: bool
     started: bool
@@ -37,20 +39,72 @@ def _find_chrome_exe() -> Optional[str]:
     return None
 
 
+class _ProcessEntry32(ctypes.Structure):
+    """PROCESSENTRY32W from tlhelp32.h."""
+
+    _fields_ = [
+        ("dwSize", ctypes.c_uint32),
+        ("cntUsage", ctypes.c_uint32),
+        ("th32ProcessID", ctypes.c_uint32),
+        ("th32DefaultHeapID", ctypes.c_size_t),
+        ("th32ModuleID", ctypes.c_uint32),
+        ("cntThreads", ctypes.c_uint32),
+        ("th32ParentProcessID", ctypes.c_uint32),
+        ("pcPriClassBase", ctypes.c_long),
+        ("dwFlags", ctypes.c_uint32),
+        ("szExeFile", ctypes.c_wchar * 260),
+    ]
+
+
+_TH32CS_SNAPPROCESS = 0x00000002
+_INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+
+@lru_cache(maxsize=1)
+def _kernel32() -> ctypes.WinDLL:
+    """Load a private kernel32 handle with the Toolhelp32 prototypes declared.
+
+    A separate WinDLL instance keeps these argtypes/restype off the shared
+    ctypes.windll.kernel32 function objects that other code relies on.
+    """
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.CreateToolhelp32Snapshot.argtypes = [ctypes.c_uint32, ctypes.c_uint32]
+    kernel32.CreateToolhelp32Snapshot.restype = ctypes.c_void_p
+    kernel32.Process32FirstW.argtypes = [ctypes.c_void_p, ctypes.POINTER(_ProcessEntry32)]
+    kernel32.Process32FirstW.restype = ctypes.c_int
+    kernel32.Process32NextW.argtypes = [ctypes.c_void_p, ctypes.POINTER(_ProcessEntry32)]
+    kernel32.Process32NextW.restype = ctypes.c_int
+    kernel32.CloseHandle.argtypes = [ctypes.c_void_p]
+    kernel32.CloseHandle.restype = ctypes.c_int
+    return kernel32
+
+
 def _is_process_running(image_name: str) -> bool:
-    """Return True if an image name is present in tasklist.
+    """Return True if a process with this image name is running.
+
+    Walks a Toolhelp32 process snapshot in-process instead of spawning
+    tasklist.exe, which costs tens to hundreds of milliseconds per call.
 
     Windows-only.
     """
     try:
-        completed = subprocess.run(
-            ["tasklist", "/FI", f"IMAGENAME eq {image_name}"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        out = (completed.stdout or "").lower()
-        return image_name.lower() in out
+        kernel32 = _kernel32()
+        snapshot = kernel32.CreateToolhelp32Snapshot(_TH32CS_SNAPPROCESS, 0)
+        if not snapshot or snapshot == _INVALID_HANDLE_VALUE:
+            return False
+
+        try:
+            target = image_name.lower()
+            entry = _ProcessEntry32()
+            entry.dwSize = ctypes.sizeof(_ProcessEntry32)
+            ok = kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+            while ok:
+                if entry.szExeFile.lower() == target:
+                    return True
+                ok = kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+            return False
+        finally:
+            kernel32.CloseHandle(snapshot)
     except Exception:
         return False
 
@@ -2,12 +2,14 @@
 Configuration management for MCP Desktop Visual.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field, fields
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
-import json
+from typing import Callable, Optional, get_origin
 import os
 
+import orjson
+
 
 @dataclass
 class CaptureConfig:
@@ -50,6 +52,11 @@ class OCRConfig:
     
     # Enable preprocessing (lighter preprocessing in fast mode)
     preprocessing: bool = True
+    
+    # Directory with the .traineddata files (None = Tesseract's default).
+    # Point it at tessdata_fast, whose LSTM models are integer-quantized,
+    # for faster OCR than the float tessdata_best models
+    tessdata_dir: Optional[str] = None
 
 
 @dataclass 
@@ -76,6 +83,14 @@ class ElementDetectionConfig:
     
     # Edge detection sensitivity
     edge_sensitivity: int = 50
+    
+    # Halve images taller than this before OCR (0 = never). For high-DPI
+    # screens, where text is large enough to survive the downscale
+    ocr_downscale_above: int = 0
+    
+    # Run Canny/morphology on large frames through OpenCL (cv2.UMat) when
+    # a device is available. Results can differ slightly between drivers
+    use_opencl: bool = False
 
 
 @dataclass
@@ -114,6 +129,9 @@ class CacheConfig:
     
     # Enable element grouping by window
     group_by_window: bool = True
+    
+    # Check index consistency after every update (slow; for debugging)
+    validate_indexes: bool = False
 
 
 @dataclass
@@ -155,16 +173,7 @@ class Config:
     def load(cls, path: Optional[Path] = None) -> "Config":
         """Load configuration from file or use defaults."""
         if path is None:
-            # Try common locations
-            candidates = [
-                Path.cwd() / "mcp-desktop-config.json",
-                Path.home() / ".mcp-desktop" / "config.json",
-                Path(os.getenv("APPDATA", "")) / "mcp-desktop" / "config.json",
-            ]
-            for candidate in candidates:
-                if candidate.exists():
-                    path = candidate
-                    break
+            path = _resolve_config_path()
         
         if path and path.exists():
             return cls.from_json(path)
@@ -174,97 +183,66 @@ class Config:
     @classmethod
     def from_json(cls, path: Path) -> "Config":
         """Load configuration from JSON file."""
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _read_json(Path(path), Path(path).stat().st_mtime_ns)
         
         config = cls()
         
-        if "capture" in data:
-            for key, value in data["capture"].items():
-                if hasattr(config.capture, key):
-                    setattr(config.capture, key, value)
-        
-        if "ocr" in data:
-            for key, value in data["ocr"].items():
-                if hasattr(config.ocr, key):
-                    setattr(config.ocr, key, value)
-        
-        if "element_detection" in data:
-            for key, value in data["element_detection"].items():
-                if hasattr(config.element_detection, key):
-                    if key in ("min_element_size", "max_element_size"):
-                        value = tuple(value)
-                    setattr(config.element_detection, key, value)
-        
-        if "input" in data:
-            for key, value in data["input"].items():
-                if hasattr(config.input, key):
-                    setattr(config.input, key, value)
-        
-        if "cache" in data:
-            for key, value in data["cache"].items():
-                if hasattr(config.cache, key):
-                    setattr(config.cache, key, value)
-        
-        if "server" in data:
-            for key, value in data["server"].items():
-                if hasattr(config.server, key):
-                    setattr(config.server, key, value)
+        for section, field_table in _SECTION_FIELDS.items():
+            values = data.get(section)
+            if not values:
+                continue
+            target = getattr(config, section)
+            for key, value in values.items():
+                if key not in field_table:
+                    continue
+                convert = field_table[key]
+                setattr(target, key, convert(value) if convert else value)
         
         return config
     
     def to_json(self, path: Path) -> None:
         """Save configuration to JSON file."""
-        data = {
-            "capture": {
-                "monitor": self.capture.monitor,
-                "capture_interval": self.capture.capture_interval,
-                "diff_threshold": self.capture.diff_threshold,
-                "min_region_area": self.capture.min_region_area,
-                "max_regions": self.capture.max_regions,
-                "diff_scale": self.capture.diff_scale,
-            },
-            "ocr": {
-                "tesseract_path": self.ocr.tesseract_path,
-                "language": self.ocr.language,
-                "psm": self.ocr.psm,
-                "confidence_threshold": self.ocr.confidence_threshold,
-                "preprocessing": self.ocr.preprocessing,
-            },
-            "element_detection": {
-                "detect_buttons": self.element_detection.detect_buttons,
-                "detect_inputs": self.element_detection.detect_inputs,
-                "detect_checkboxes": self.element_detection.detect_checkboxes,
-                "detect_icons": self.element_detection.detect_icons,
-                "min_element_size": list(self.element_detection.min_element_size),
-                "max_element_size": list(self.element_detection.max_element_size),
-                "edge_sensitivity": self.element_detection.edge_sensitivity,
-            },
-            "input": {
-                "click_delay": self.input.click_delay,
-                "typing_delay": self.input.typing_delay,
-                "move_duration": self.input.move_duration,
-                "failsafe": self.input.failsafe,
-                "pause_after_action": self.input.pause_after_action,
-            },
-            "cache": {
-                "max_elements": self.cache.max_elements,
-                "max_history": self.cache.max_history,
-                "position_tolerance": self.cache.position_tolerance,
-                "group_by_window": self.cache.group_by_window,
-            },
-            "server": {
-                "name": self.server.name,
-                "version": self.server.version,
-                "debug": self.server.debug,
-                "log_file": self.server.log_file,
-                "max_concurrent": self.server.max_concurrent,
-            },
-        }
-        
         path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        path.write_bytes(orjson.dumps(asdict(self), option=orjson.OPT_INDENT_2))
+
+
+@lru_cache(maxsize=1)
+def _resolve_config_path() -> Optional[Path]:
+    """Find the first existing config file in the common locations (once per process)."""
+    candidates = [
+        Path.cwd() / "mcp-desktop-config.json",
+        Path.home() / ".mcp-desktop" / "config.json",
+        Path(os.getenv("APPDATA", "")) / "mcp-desktop" / "config.json",
+    ]
+    for candidate in candidates:
+        if candidate.exists():
+            return candidate
+    return None
+
+
+@lru_cache(maxsize=8)
+def _read_json(path: Path, mtime_ns: int) -> dict:
+    """
+    Parse a JSON config file.
+    
+    Cached on (path, mtime_ns), so reloading an unchanged file skips
+    parsing. Callers must not mutate the returned dict.
+    """
+    return orjson.loads(path.read_bytes())
+
+
+def _field_table(cls: type) -> dict[str, Optional[Callable]]:
+    """Map a config dataclass's field names to a JSON value converter (or None)."""
+    return {
+        f.name: tuple if get_origin(f.type) is tuple else None
+        for f in fields(cls)
+    }
+
+
+# Section name -> field table, built once for from_json
+_SECTION_FIELDS: dict[str, dict[str, Optional[Callable]]] = {
+    f.name: _field_table(f.default_factory) for f in fields(Config)
+}
 
 
 # Global configuration instance
@@ -5,6 +5,10 @@ Detects UI elements (buttons, inputs, etc.) from screen images
 using image processing and heuristics.
 """
 
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Optional
 import numpy as np
@@ -12,7 +16,132 @@ import cv2
 
 from .config import get_config, ElementDetectionConfig
 from .models import BoundingBox, UIElement, ElementType
-from .ocr import OCREngine, get_ocr_engine
+from .ocr import OCREngine, WordResult, get_ocr_engine
+
+
+# Images at least this large (both sides) get their shape edges computed
+# at half resolution
+_EDGE_DOWNSCALE_MIN_SIDE = 200
+
+# Number of images whose OCR words are kept by _detect_text
+_OCR_CACHE_SIZE = 64
+
+# Grid cell size (pixels) used to bucket kept elements during NMS
+_NMS_CELL = 64
+
+# Canny thresholds for shape edges (buttons/checkboxes) and for the fainter
+# borders of text inputs
+_CANNY_LO, _CANNY_HI = 50, 150
+_CANNY_INPUT_LO, _CANNY_INPUT_HI = 30, 100
+
+# Frames with fewer pixels than this stay on the CPU even with use_opencl:
+# the upload/download costs more than the GPU saves
+_OPENCL_MIN_PIXELS = 1_000_000
+
+# Morphology kernels; read-only, so shared by every detector and thread
+_KERNEL3 = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+_KERNEL_H = cv2.getStructuringElement(cv2.MORPH_RECT, (25, 1))
+
+
+# Batched OCR (detect_batch): border added around each tile so words don't
+# run across tiles, and the minimum width of a mosaic row
+_OCR_TILE_PAD = 16
+_OCR_MOSAIC_WIDTH = 2048
+
+# Batched OCR is split into parallel Tesseract runs, at most one per
+# detector pool worker, once the tiles add up to this many pixels per run
+_DETECT_WORKERS = 4
+_OCR_SPLIT_MIN_PIXELS = 250_000
+
+
+def _image_digest(image: np.ndarray) -> tuple:
+    """Exact content key for an image (shape, dtype and a hash of the pixels)."""
+    digest = hashlib.blake2b(np.ascontiguousarray(image), digest_size=16).digest()
+    return image.shape, image.dtype.str, digest
+
+
+def _split_tiles(tiles: list[np.ndarray]) -> list[list[int]]:
+    """
+    Split tiles into groups of similar total area, one mosaic each.
+    
+    The number of groups grows with the total area (_OCR_SPLIT_MIN_PIXELS
+    per group) up to _DETECT_WORKERS. Tiles are dealt largest first to the
+    group with the least area so far.
+    
+    Returns:
+        Lists of indices into tiles, each in ascending order
+    """
+    areas = [t.shape[0] * t.shape[1] for t in tiles]
+    count = min(_DETECT_WORKERS, len(tiles), max(1, sum(areas) // _OCR_SPLIT_MIN_PIXELS))
+    if count == 1:
+        return [list(range(len(tiles)))]
+    
+    groups: list[list[int]] = [[] for _ in range(count)]
+    totals = [0] * count
+    for i in sorted(range(len(tiles)), key=areas.__getitem__, reverse=True):
+        g = totals.index(min(totals))
+        groups[g].append(i)
+        totals[g] += areas[i]
+    return [sorted(group) for group in groups]
+
+
+def _border_color(image: np.ndarray) -> np.ndarray:
+    """Median colour of an image's outermost pixels, i.e. its background."""
+    edge = np.concatenate([image[0], image[-1], image[:, 0], image[:, -1]])
+    return np.median(edge, axis=0).astype(np.uint8)
+
+
+def _pack_tiles(images: list[np.ndarray]) -> tuple[np.ndarray, list[tuple[int, int]]]:
+    """
+    Pack BGR images into one mosaic for a single OCR pass.
+    
+    Shelf packing, tallest first: tiles fill rows left to right, and each
+    tile is surrounded by _OCR_TILE_PAD pixels of its own replicated
+    border. The rest of a tile's slot (down to the bottom of its row, and
+    to the end of the row for the last tile) is filled with the tile's
+    median border colour, so dark-theme tiles don't sit on a white sheet
+    that Tesseract's binarization would treat as the background.
+    
+    Args:
+        images: BGR images
+    
+    Returns:
+        (mosaic, top-left corner of each image inside the mosaic)
+    """
+    pad = _OCR_TILE_PAD
+    row_width = max(_OCR_MOSAIC_WIDTH, max(img.shape[1] for img in images) + 2 * pad)
+    
+    order = sorted(range(len(images)), key=lambda i: images[i].shape[0], reverse=True)
+    slots: list[tuple[int, int, int]] = [(0, 0, 0)] * len(images)  # (x, y, row)
+    row_heights: list[int] = []
+    row_last: list[int] = []  # image at the right end of each row
+    x = row_width
+    y = 0
+    for i in order:
+        h, w = images[i].shape[:2]
+        if x + w + 2 * pad > row_width:
+            if row_heights:
+                y += row_heights[-1]
+            x = 0
+            row_heights.append(0)
+            row_last.append(i)
+        slots[i] = (x, y, len(row_heights) - 1)
+        row_last[-1] = i
+        x += w + 2 * pad
+        row_heights[-1] = max(row_heights[-1], h + 2 * pad)
+    
+    mosaic = np.empty((y + row_heights[-1], row_width, 3), dtype=np.uint8)
+    origins: list[tuple[int, int]] = []
+    for i, (img, (sx, sy, row)) in enumerate(zip(images, slots)):
+        h, w = img.shape[:2]
+        slot_x2 = row_width if row_last[row] == i else sx + w + 2 * pad
+        mosaic[sy:sy + row_heights[row], sx:slot_x2] = _border_color(img)
+        mosaic[sy:sy + h + 2 * pad, sx:sx + w + 2 * pad] = cv2.copyMakeBorder(
+            img, pad, pad, pad, pad, cv2.BORDER_REPLICATE
+        )
+        origins.append((sx + pad, sy + pad))
+    
+    return mosaic, origins
 
 
 @dataclass
@@ -45,6 +174,18 @@ class ElementDetector:
     ):
         self.config = config or get_config().element_detection
         self.ocr = ocr_engine or get_ocr_engine()
+        
+        # OCR words per image digest (LRU order), bounds relative to the image
+        self._ocr_cache: OrderedDict[tuple, list[WordResult]] = OrderedDict()
+        self._ocr_cache_lock = threading.Lock()
+        
+        # Per-thread work buffers (see _scratch)
+        self._scratch_local = threading.local()
+        
+        # Runs the full-mode detectors side by side (see detect())
+        self._pool = ThreadPoolExecutor(
+            max_workers=_DETECT_WORKERS, thread_name_prefix="detector"
+        )
     
     def detect(
         self,
@@ -69,34 +210,55 @@ class ElementDetector:
         elements: list[UIElement] = []
         offset_x, offset_y = region_offset
         
-        # Convert to grayscale
-        if len(image.shape) == 3:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = image.copy()
-        
         if fast_mode:
             # FAST MODE: Just run OCR once and create text elements
             # This is much faster and sufficient for most LLM interactions
             text_elements = self._detect_text(image, offset_x, offset_y)
             elements.extend(text_elements)
         else:
-            # FULL MODE: Run all detection algorithms
+            # FULL MODE: Run all detection algorithms concurrently. OCR
+            # waits on a Tesseract subprocess and the OpenCV calls release
+            # the GIL, so they overlap; OCR (the slowest) starts first.
+            pool = self._pool
+            text_future = pool.submit(self._detect_text, image, offset_x, offset_y)
+            futures = []
+            
+            # Only the shape detectors need grayscale; OCR takes the image
+            # as is, so fast mode skips the conversion entirely
+            if len(image.shape) == 3:
+                gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            else:
+                # Read-only below, so no copy
+                gray = image
+            
+            # Buttons and checkboxes share one Canny pass but trace contours
+            # on different maps: dilation grows small boxes past the 30px
+            # checkbox gate, so checkboxes need the undilated edges
+            if self.config.detect_buttons or self.config.detect_checkboxes:
+                edges, edges_dilated, scale = self._shape_edges(gray)
+            
             if self.config.detect_buttons:
-                buttons = self._detect_buttons_fast(image, gray, offset_x, offset_y)
-                elements.extend(buttons)
+                futures.append(pool.submit(
+                    self._detect_buttons_fast,
+                    image, gray, edges_dilated, scale, offset_x, offset_y,
+                ))
             
             if self.config.detect_inputs:
-                inputs = self._detect_inputs(image, gray, offset_x, offset_y)
-                elements.extend(inputs)
+                futures.append(pool.submit(
+                    self._detect_inputs, image, gray, offset_x, offset_y
+                ))
             
             if self.config.detect_checkboxes:
-                checkboxes = self._detect_checkboxes(image, gray, offset_x, offset_y)
-                elements.extend(checkboxes)
+                futures.append(pool.submit(
+                    self._detect_checkboxes,
+                    image, gray, edges, scale, offset_x, offset_y,
+                ))
             
-            # Detect text
-            text_elements = self._detect_text(image, offset_x, offset_y)
-            elements.extend(text_elements)
+            # Collect in the sequential order (buttons, inputs, checkboxes,
+            # text) so filtering sees the same input as before
+            futures.append(text_future)
+            for future in futures:
+                elements.extend(future.result())
         
         # Remove duplicates and overlapping elements
         elements = self._filter_elements(elements)
@@ -108,59 +270,195 @@ class ElementDetector:
             processing_time_ms=processing_time,
         )
     
+    def detect_batch(
+        self,
+        images: list[np.ndarray],
+        offsets: list[tuple[int, int]],
+        fast_mode: bool = True
+    ) -> DetectionResult:
+        """
+        Detect UI elements in several images, e.g. the dirty regions of
+        one capture.
+        
+        In fast mode all images share a single OCR run (see
+        _detect_text_batch); full mode runs detect() on each image.
+        The combined elements then go through one _filter_elements pass,
+        which also drops duplicates of an element split across the seam
+        between two adjacent images.
+        
+        Args:
+            images: BGR images as numpy arrays
+            offsets: Offset to add to element positions (x, y), per image
+            fast_mode: If True, use optimized detection (skip heavy CV operations)
+        
+        Returns:
+            DetectionResult with the elements of all images
+        """
+        import time
+        start_time = time.time()
+        
+        elements: list[UIElement] = []
+        
+        if fast_mode and len(images) > 1:
+            for text_elements in self._detect_text_batch(images, offsets):
+                elements.extend(text_elements)
+        else:
+            for image, offset in zip(images, offsets):
+                elements.extend(self.detect(image, offset, fast_mode).elements)
+        
+        # Remove duplicates and overlapping elements, across images too
+        elements = self._filter_elements(elements)
+        
+        processing_time = (time.time() - start_time) * 1000
+        
+        return DetectionResult(
+            elements=elements,
+            processing_time_ms=processing_time,
+        )
+    
+    def _scratch(self, name: str, shape: tuple[int, ...]) -> np.ndarray:
+        """
+        Get a reusable uint8 work buffer.
+        
+        Buffers are kept per thread, since detect() may run concurrently,
+        and are only reallocated when the requested shape changes. The
+        contents are overwritten by the next call that asks for the same
+        name on the same thread.
+        
+        Args:
+            name: Buffer name
+            shape: Required shape
+        """
+        buffers = getattr(self._scratch_local, "buffers", None)
+        if buffers is None:
+            buffers = self._scratch_local.buffers = {}
+        buf = buffers.get(name)
+        if buf is None or buf.shape != shape:
+            buf = buffers[name] = np.empty(shape, dtype=np.uint8)
+        return buf
+    
+    def _use_opencl(self, shape: tuple[int, ...]) -> bool:
+        """Check whether an image of this shape should go through OpenCL."""
+        return (
+            self.config.use_opencl
+            and shape[0] * shape[1] >= _OPENCL_MIN_PIXELS
+            and cv2.ocl.haveOpenCL()
+        )
+    
+    def _shape_edges(self, gray: np.ndarray) -> tuple[np.ndarray, np.ndarray, int]:
+        """
+        Compute the Canny edge map shared by button and checkbox detection.
+        
+        Large images are halved (INTER_AREA) first: Canny, dilation and
+        contour tracing are bound by pixel traffic, so this touches 4x
+        fewer bytes. Callers multiply contour coordinates by the scale.
+        
+        Args:
+            gray: Grayscale image
+        
+        Returns:
+            (edges, edges dilated by 3x3, scale back to gray's resolution)
+        """
+        h, w = gray.shape[:2]
+        if min(h, w) >= _EDGE_DOWNSCALE_MIN_SIDE:
+            gray = cv2.resize(
+                gray, (w // 2, h // 2),
+                dst=self._scratch("gray_small", (h // 2, w // 2)),
+                interpolation=cv2.INTER_AREA,
+            )
+            scale = 2
+        else:
+            scale = 1
+        
+        # Canny rather than a thresholded Scharr magnitude: without
+        # non-maximum suppression the edge bands are thicker, which
+        # shifts boxes and merges nearby controls for little time saved
+        if self._use_opencl(gray.shape):
+            # Contours are traced on the CPU, so both maps come back
+            edges_u = cv2.Canny(cv2.UMat(gray), _CANNY_LO, _CANNY_HI)
+            edges_dilated = cv2.dilate(edges_u, _KERNEL3).get()
+            return edges_u.get(), edges_dilated, scale
+        
+        edges = cv2.Canny(gray, _CANNY_LO, _CANNY_HI, edges=self._scratch("edges", gray.shape))
+        
+        # Dilate to connect nearby edges
+        edges_dilated = cv2.dilate(
+            edges, _KERNEL3, dst=self._scratch("edges_dilated", gray.shape)
+        )
+        
+        return edges, edges_dilated, scale
+    
     def _detect_buttons_fast(
         self,
         image: np.ndarray,
         gray: np.ndarray,
+        edges: np.ndarray,
+        scale: int,
         offset_x: int,
         offset_y: int
     ) -> list[UIElement]:
         """
         Fast button detection without individual OCR per button.
         Uses shape detection only - text will be matched from OCR results.
+        
+        Args:
+            edges: Dilated edge map from _shape_edges
+            scale: Factor from edge map to gray coordinates
         """
         elements = []
         
-        # Detect edges
-        edges = cv2.Canny(gray, 50, 150)
-        
-        # Dilate to connect nearby edges
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
-        edges = cv2.dilate(edges, kernel, iterations=1)
-        
-        # Find contours
+        # Find contours. CHAIN_APPROX_SIMPLE on purpose: TC89_KCOS stores
+        # fewer points but moves boundingRect on curved outlines and is
+        # slower end-to-end, since it does the curvature pass up front.
         contours, _ = cv2.findContours(
             edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
         )
         
+        if not contours:
+            return elements
+        
         min_w, min_h = self.config.min_element_size
         max_w, max_h = self.config.max_element_size
+        gray_h, gray_w = gray.shape[:2]
+        
+        # Cheap size/aspect/uniformity gates run over all bounding rects at
+        # once; only the survivors reach the per-contour polygon test below
+        rects = np.array([cv2.boundingRect(c) for c in contours], dtype=np.int64) * scale
+        x, y, w, h = rects.T
+        aspect_ratio = np.divide(w, h, out=np.zeros(len(rects)), where=h > 0)
+        keep = (
+            (w >= min_w) & (h >= min_h) & (w <= max_w) & (h <= max_h)
+            & (aspect_ratio >= 0.5) & (aspect_ratio <= 8)
+        )
         
-        for contour in contours:
+        # Buttons have fairly uniform backgrounds: reject std dev > 80,
+        # computed from the integral images in O(1) per rectangle
+        x2, y2 = np.minimum(x + w, gray_w), np.minimum(y + h, gray_h)
+        n = (x2 - x) * (y2 - y)
+        keep &= n > 0
+        candidates = np.flatnonzero(keep)
+        if len(candidates) == 0:
+            return elements
+        
+        sums, sq_sums = cv2.integral2(gray, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F)
+        cx, cy, cx2, cy2 = x[candidates], y[candidates], x2[candidates], y2[candidates]
+        total = sums[cy2, cx2] - sums[cy, cx2] - sums[cy2, cx] + sums[cy, cx]
+        sq_total = sq_sums[cy2, cx2] - sq_sums[cy, cx2] - sq_sums[cy2, cx] + sq_sums[cy, cx]
+        mean = total / n[candidates]
+        candidates = candidates[sq_total / n[candidates] - mean * mean <= 80 * 80]
+        
+        # The corner count is what keeps round icons, radio buttons and
+        # text blobs that pass the rect gates from being reported as buttons
+        for i in candidates.tolist():
+            contour = contours[i]
             epsilon = 0.02 * cv2.arcLength(contour, True)
             approx = cv2.approxPolyDP(contour, epsilon, True)
             
             if len(approx) < 4 or len(approx) > 8:
                 continue
             
-            x, y, w, h = cv2.boundingRect(contour)
-            
-            if w < min_w or h < min_h or w > max_w or h > max_h:
-                continue
-            
-            aspect_ratio = w / h if h > 0 else 0
-            if aspect_ratio < 0.5 or aspect_ratio > 8:
-                continue
-            
-            region = gray[y:y+h, x:x+w]
-            if region.size == 0:
-                continue
-            
-            std_dev = np.std(region)
-            if std_dev > 80:
-                continue
-            
-            bounds = BoundingBox(x + offset_x, y + offset_y, w, h)
+            x_i, y_i, w_i, h_i = rects[i].tolist()
+            bounds = BoundingBox(x_i + offset_x, y_i + offset_y, w_i, h_i)
             
             # No OCR here - just detect the shape
             elements.append(UIElement.create(
@@ -182,11 +480,10 @@ class ElementDetector:
         elements = []
         
         # Detect edges
-        edges = cv2.Canny(gray, 50, 150)
+        edges = cv2.Canny(gray, _CANNY_LO, _CANNY_HI)
         
         # Dilate to connect nearby edges
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
-        edges = cv2.dilate(edges, kernel, iterations=1)
+        edges = cv2.dilate(edges, _KERNEL3, iterations=1)
         
         # Find contours
         contours, _ = cv2.findContours(
@@ -197,14 +494,6 @@ class ElementDetector:
         max_w, max_h = self.config.max_element_size
         
         for contour in contours:
-            # Approximate contour to polygon
-            epsilon = 0.02 * cv2.arcLength(contour, True)
-            approx = cv2.approxPolyDP(contour, epsilon, True)
-            
-            # Buttons are typically rectangular (4 corners)
-            if len(approx) < 4 or len(approx) > 8:
-                continue
-            
             x, y, w, h = cv2.boundingRect(contour)
             
             # Filter by size
@@ -216,6 +505,14 @@ class ElementDetector:
             if aspect_ratio < 0.3 or aspect_ratio > 10:
                 continue
             
+            # Approximate contour to polygon
+            epsilon = 0.02 * cv2.arcLength(contour, True)
+            approx = cv2.approxPolyDP(contour, epsilon, True)
+            
+            # Buttons are typically rectangular (4 corners)
+            if len(approx) < 4 or len(approx) > 8:
+                continue
+            
             # Check if region has consistent background (button-like)
             region = gray[y:y+h, x:x+w]
             if region.size == 0:
@@ -250,15 +547,26 @@ class ElementDetector:
         offset_x: int,
         offset_y: int
     ) -> list[UIElement]:
-        """Detect text input fields."""
-        elements = []
+        """
+        Detect text input fields.
         
-        # Input fields are typically rectangular with distinct borders
-        edges = cv2.Canny(gray, 30, 100)
+        Works from the edge map rather than from OCR word positions, so
+        fields without a label or placeholder are found too, and it runs
+        alongside OCR instead of waiting for it.
+        """
+        elements = []
         
+        # Input fields are typically rectangular with distinct borders.
         # Find horizontal lines (input fields often have bottom border)
-        horizontal_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (25, 1))
-        horizontal = cv2.morphologyEx(edges, cv2.MORPH_OPEN, horizontal_kernel)
+        if self._use_opencl(gray.shape):
+            edges_u = cv2.Canny(cv2.UMat(gray), _CANNY_INPUT_LO, _CANNY_INPUT_HI)
+            horizontal = cv2.morphologyEx(edges_u, cv2.MORPH_OPEN, _KERNEL_H).get()
+        else:
+            edges = cv2.Canny(
+                gray, _CANNY_INPUT_LO, _CANNY_INPUT_HI,
+                edges=self._scratch("input_edges", gray.shape),
+            )
+            horizontal = cv2.morphologyEx(edges, cv2.MORPH_OPEN, _KERNEL_H, dst=edges)
         
         # Find contours in horizontal lines
         contours, _ = cv2.findContours(
@@ -298,30 +606,41 @@ class ElementDetector:
         self,
         image: np.ndarray,
         gray: np.ndarray,
+        edges: np.ndarray,
+        scale: int,
         offset_x: int,
         offset_y: int
     ) -> list[UIElement]:
-        """Detect checkboxes and radio buttons."""
+        """
+        Detect checkboxes and radio buttons.
+        
+        Args:
+            edges: Edge map from _shape_edges
+            scale: Factor from edge map to gray coordinates
+        """
         elements = []
         
         # Look for small square/circular regions
-        edges = cv2.Canny(gray, 50, 150)
-        
         contours, _ = cv2.findContours(
             edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
         )
         
-        for contour in contours:
-            x, y, w, h = cv2.boundingRect(contour)
-            
-            # Checkboxes are small and roughly square
-            if w < 10 or w > 30 or h < 10 or h > 30:
-                continue
-            
-            # Check aspect ratio (should be close to 1:1)
-            aspect_ratio = w / h if h > 0 else 0
-            if aspect_ratio < 0.7 or aspect_ratio > 1.4:
-                continue
+        if not contours:
+            return elements
+        
+        # Checkboxes are small and roughly square (aspect close to 1:1);
+        # gate all bounding rects at once before any per-contour work
+        rects = np.array([cv2.boundingRect(c) for c in contours], dtype=np.int64) * scale
+        w, h = rects[:, 2], rects[:, 3]
+        aspect_ratio = np.divide(w, h, out=np.zeros(len(rects)), where=h > 0)
+        keep = (
+            (w >= 10) & (w <= 30) & (h >= 10) & (h <= 30)
+            & (aspect_ratio >= 0.7) & (aspect_ratio <= 1.4)
+        )
+        
+        for i in np.flatnonzero(keep).tolist():
+            contour = contours[i]
+            x, y, w_i, h_i = rects[i].tolist()
             
             # Calculate circularity
             area = cv2.contourArea(contour)
@@ -337,7 +656,7 @@ class ElementDetector:
             else:
                 elem_type = ElementType.CHECKBOX
             
-            bounds = BoundingBox(x + offset_x, y + offset_y, w, h)
+            bounds = BoundingBox(x + offset_x, y + offset_y, w_i, h_i)
             
             elements.append(UIElement.create(
                 type=elem_type,
@@ -353,16 +672,171 @@ class ElementDetector:
         offset_x: int,
         offset_y: int
     ) -> list[UIElement]:
-        """Detect text elements using OCR."""
-        elements = []
+        """
+        Detect text elements using OCR.
+        
+        OCR output is cached per exact image content, so a region that is
+        analyzed again without having changed skips Tesseract. Cached word
+        bounds are relative to the image and shifted by the offset here.
+        Images taller than config.ocr_downscale_above are OCR'd at half
+        resolution and the word bounds scaled back up.
+        """
+        key = _image_digest(image)
+        words = self._cached_words(key)
+        
+        if words is None:
+            limit = self.config.ocr_downscale_above
+            if limit and image.shape[0] > limit:
+                # OCR cost is roughly linear in pixels; on high-DPI screens
+                # half resolution still leaves text readable
+                small = cv2.resize(image, None, fx=0.5, fy=0.5, interpolation=cv2.INTER_AREA)
+                words = [
+                    WordResult(
+                        text=w.text,
+                        confidence=w.confidence,
+                        bounds=BoundingBox(
+                            w.bounds.x * 2, w.bounds.y * 2,
+                            w.bounds.width * 2, w.bounds.height * 2,
+                        ),
+                    )
+                    for w in self.ocr.extract_text(small).words
+                ]
+            else:
+                words = self.ocr.extract_text(image).words
+            self._cache_words(key, words)
         
-        ocr_result = self.ocr.extract_text(image, (offset_x, offset_y))
+        return self._text_elements(words, offset_x, offset_y)
+    
+    def _detect_text_batch(
+        self,
+        images: list[np.ndarray],
+        offsets: list[tuple[int, int]]
+    ) -> list[list[UIElement]]:
+        """
+        Detect text elements in several images with few OCR calls.
+        
+        Images not in the OCR cache are packed into mosaics (see
+        _pack_tiles) so many small regions pay the Tesseract process start
+        and model load once. Light- and dark-background tiles never share a
+        mosaic. Small batches use one mosaic per background; larger ones
+        are split by area into up to _DETECT_WORKERS mosaics read in
+        parallel on the detector pool, since each Tesseract run is mostly
+        single-threaded. Images that would be downscaled
+        (config.ocr_downscale_above) go through _detect_text instead.
         
-        for word in ocr_result.words:
+        Returns:
+            Text elements per image, in input order
+        """
+        keys = [_image_digest(img) for img in images]
+        words: list[Optional[list[WordResult]]] = [self._cached_words(k) for k in keys]
+        
+        limit = self.config.ocr_downscale_above
+        misses = [
+            i for i, w in enumerate(words)
+            if w is None and not (limit and images[i].shape[0] > limit)
+        ]
+        
+        if len(misses) > 1:
+            tiles = [
+                images[i] if images[i].ndim == 3
+                else cv2.cvtColor(images[i], cv2.COLOR_GRAY2BGR)
+                for i in misses
+            ]
+            # Light- and dark-background tiles go to separate mosaics, so
+            # each OCR run sees a single background polarity
+            dark = [int(_border_color(t).mean()) < 128 for t in tiles]
+            groups: list[list[int]] = []
+            for polarity in (False, True):
+                part = [n for n, d in enumerate(dark) if d == polarity]
+                if part:
+                    groups.extend(
+                        [part[k] for k in group]
+                        for group in _split_tiles([tiles[n] for n in part])
+                    )
+            if len(groups) == 1:
+                found = [self._ocr_mosaic(tiles)]
+            else:
+                futures = [
+                    self._pool.submit(self._ocr_mosaic, [tiles[n] for n in group])
+                    for group in groups
+                ]
+                found = [future.result() for future in futures]
+            
+            for group, group_words in zip(groups, found):
+                for n, tile_words in zip(group, group_words):
+                    i = misses[n]
+                    words[i] = tile_words
+                    self._cache_words(keys[i], tile_words)
+        
+        results: list[list[UIElement]] = []
+        for img, (ox, oy), img_words in zip(images, offsets, words):
+            if img_words is None:
+                results.append(self._detect_text(img, ox, oy))
+            else:
+                results.append(self._text_elements(img_words, ox, oy))
+        return results
+    
+    def _ocr_mosaic(self, tiles: list[np.ndarray]) -> list[list[WordResult]]:
+        """
+        OCR BGR tiles in one run and split the words back per tile.
+        
+        Each word is assigned to the tile it overlaps and clipped to it;
+        words lying entirely in the padding are dropped.
+        
+        Returns:
+            Tile-relative words per tile, in input order
+        """
+        mosaic, origins = _pack_tiles(tiles)
+        found: list[list[WordResult]] = [[] for _ in tiles]
+        
+        for word in self.ocr.extract_text(mosaic).words:
+            b = word.bounds
+            for n, ((ox, oy), tile) in enumerate(zip(origins, tiles)):
+                h, w = tile.shape[:2]
+                # Clip to the tile: text on a tile edge is replicated
+                # into the padding, so the word can extend past it
+                x, y = max(b.x - ox, 0), max(b.y - oy, 0)
+                x2, y2 = min(b.x2 - ox, w), min(b.y2 - oy, h)
+                if x2 > x and y2 > y:
+                    found[n].append(WordResult(
+                        text=word.text,
+                        confidence=word.confidence,
+                        bounds=BoundingBox(x, y, x2 - x, y2 - y),
+                    ))
+                    break
+        
+        return found
+    
+    def _cached_words(self, key: tuple) -> Optional[list[WordResult]]:
+        """Look up OCR words by image digest, refreshing the LRU order."""
+        with self._ocr_cache_lock:
+            words = self._ocr_cache.get(key)
+            if words is not None:
+                self._ocr_cache.move_to_end(key)
+        return words
+    
+    def _cache_words(self, key: tuple, words: list[WordResult]) -> None:
+        """Store OCR words by image digest, evicting the oldest entry."""
+        with self._ocr_cache_lock:
+            self._ocr_cache[key] = words
+            if len(self._ocr_cache) > _OCR_CACHE_SIZE:
+                self._ocr_cache.popitem(last=False)
+    
+    @staticmethod
+    def _text_elements(
+        words: list[WordResult],
+        offset_x: int,
+        offset_y: int
+    ) -> list[UIElement]:
+        """Create text elements from image-relative OCR words."""
+        elements = []
+        
+        for word in words:
+            b = word.bounds
             # Create text element for each detected word
             elements.append(UIElement.create(
                 type=ElementType.TEXT,
-                bounds=word.bounds,
+                bounds=BoundingBox(b.x + offset_x, b.y + offset_y, b.width, b.height),
                 text=word.text,
                 label=word.text,
                 confidence=word.confidence,
@@ -370,50 +844,67 @@ class ElementDetector:
         
         return elements
     
-    def _filter_elements(self, elements: list[UIElement]) -> list[UIElement]:
-        """Remove duplicate and overlapping elements."""
-        if len(elements) <= 1:
+    def _filter_elements(
+        self,
+        elements: list[UIElement],
+        threshold: float = 0.5
+    ) -> list[UIElement]:
+        """
+        Remove duplicate and overlapping elements.
+        
+        Greedy non-maximum suppression: going from the most confident
+        element down, an element is dropped when its overlap with an
+        already kept one exceeds threshold times the smaller of the two
+        areas. Kept elements are binned into a coarse grid, so each
+        element is only compared against kept ones sharing a cell rather
+        than against everything kept so far.
+        """
+        n = len(elements)
+        if n <= 1:
             return elements
         
         # Sort by confidence (higher first)
         elements.sort(key=lambda e: e.confidence, reverse=True)
         
-        filtered = []
-        
-        for elem in elements:
-            # Check for significant overlap with existing elements
-            is_duplicate = False
-            
-            for existing in filtered:
-                if self._elements_overlap(elem, existing, threshold=0.5):
-                    is_duplicate = True
+        cell = _NMS_CELL
+        grid: dict[tuple[int, int], list[tuple[int, int, int, int, int]]] = {}
+        keep: list[UIElement] = []
+        
+        # Geometry is read straight off each element: the loop is bound by
+        # the grid lookups, and copying bounds into parallel arrays first
+        # measured no faster
+        for element in elements:
+            b = element.bounds
+            x1, y1, x2, y2 = b.x, b.y, b.x2, b.y2
+            area = b.width * b.height
+            cells = [
+                (cx, cy)
+                for cx in range(x1 // cell, x2 // cell + 1)
+                for cy in range(y1 // cell, y2 // cell + 1)
+            ]
+            
+            suppressed = False
+            for key in cells:
+                for kx1, ky1, kx2, ky2, k_area in grid.get(key, ()):
+                    inter_w = min(x2, kx2) - max(x1, kx1)
+                    inter_h = min(y2, ky2) - max(y1, ky1)
+                    if inter_w <= 0 or inter_h <= 0:
+                        continue
+                    min_area = min(area, k_area)
+                    if min_area > 0 and inter_w * inter_h > threshold * min_area:
+                        suppressed = True
+                        break
+                if suppressed:
                     break
+            if suppressed:
+                continue
             
-            if not is_duplicate:
-                filtered.append(elem)
-        
-        return filtered
-    
-    def _elements_overlap(
-        self,
-        elem1: UIElement,
-        elem2: UIElement,
-        threshold: float = 0.5
-    ) -> bool:
-        """Check if two elements overlap significantly."""
-        intersection = elem1.bounds.intersection(elem2.bounds)
-        if intersection is None:
-            return False
-        
-        # Calculate overlap ratio
-        intersection_area = intersection.area
-        min_area = min(elem1.bounds.area, elem2.bounds.area)
-        
-        if min_area == 0:
-            return False
+            keep.append(element)
+            entry = (x1, y1, x2, y2, area)
+            for key in cells:
+                grid.setdefault(key, []).append(entry)
         
-        overlap_ratio = intersection_area / min_area
-        return overlap_ratio > threshold
+        return keep
 
 
 # Global detector instance
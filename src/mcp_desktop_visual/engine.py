@@ -10,9 +10,13 @@ Uses a provider-based architecture:
 """
 
 import asyncio
+import logging
+import queue
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Sequence
 import numpy as np
 
 from .config import Config, get_config
@@ -25,7 +29,15 @@ from .ocr import OCREngine, get_ocr_engine
 from .detector import ElementDetector, get_element_detector
 from .cache import VisualStateCache, get_visual_cache
 from .input import InputController, MouseButton, get_input_controller
-from .windows import get_all_windows, get_screen_size, get_active_window_info
+from .windows import (
+    WindowEventWatcher, get_all_windows, get_screen_size, get_active_window_info
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Growth factor for the polling interval while the screen is idle
+_POLL_BACKOFF = 1.5
 
 
 class DesktopVisualEngine:
@@ -61,6 +73,28 @@ class DesktopVisualEngine:
         self._is_running = False
         self._last_capture_time = 0.0
         self._capture_count = 0
+        
+        # Capture and analysis run under separate locks so that, while
+        # monitoring, the next frame is grabbed while the previous one is
+        # still being analyzed (see _analyze_loop)
+        self._capture_lock = threading.Lock()
+        self._analyze_lock = threading.Lock()
+        self._analyze_queue: Optional[queue.Queue] = None
+        self._analyze_thread: Optional[threading.Thread] = None
+        
+        # Change notification (see subscribe() / start_monitoring())
+        self._subscribers: list[queue.Queue] = []
+        self._change_waiters: set[threading.Event] = set()
+        self._monitor_thread: Optional[threading.Thread] = None
+        self._monitor_stop = threading.Event()
+        
+        # Worker that enumerates windows while the caller grabs and diffs
+        # (created on first capture, shut down by stop()). The last
+        # enumeration is reused until a WinEvent hook reports that a
+        # window appeared, closed, moved, was renamed or activated
+        self._window_pool: Optional[ThreadPoolExecutor] = None
+        self._window_events = WindowEventWatcher()
+        self._windows_future: Optional["Future[list[WindowInfo]]"] = None
     
     def _get_provider_registry(self):
         """Lazy-load the provider registry."""
@@ -77,6 +111,7 @@ class DesktopVisualEngine:
     def start(self) -> None:
         """Start the engine."""
         self._capture.start()
+        self._window_events.start()
         self._is_running = True
         
         # Initial full capture
@@ -84,7 +119,14 @@ class DesktopVisualEngine:
     
     def stop(self) -> None:
         """Stop the engine."""
+        self.stop_monitoring()
         self._capture.stop()
+        self._window_events.stop()
+        with self._capture_lock:
+            if self._window_pool is not None:
+                self._window_pool.shutdown(wait=False, cancel_futures=True)
+                self._window_pool = None
+            self._windows_future = None
         self._is_running = False
     
     def __enter__(self) -> "DesktopVisualEngine":
@@ -101,7 +143,9 @@ class DesktopVisualEngine:
         Capture the screen and analyze for elements.
         
         Uses incremental capture when possible to only process
-        regions that have changed.
+        regions that have changed. Frames are analyzed in the order they
+        were captured; while monitoring is active the frame is handed to
+        the analysis thread and this call waits for its result.
         
         Args:
             force_full: Force a full screen analysis
@@ -109,18 +153,68 @@ class DesktopVisualEngine:
         Returns:
             VisualDiff showing what changed
         """
-        start_time = time.time()
+        with self._capture_lock:
+            frame = self._capture_frame(force_full)
+            pipeline = self._analyze_queue
+            if pipeline is not None:
+                done: Future = Future()
+                pipeline.put((frame, done))
+            else:
+                # Taken before the capture lock is released, so callers
+                # analyze in capture order
+                self._analyze_lock.acquire()
+        
+        if pipeline is not None:
+            return done.result()
         
-        # Capture screen
+        try:
+            diff = self._analyze_frame(*frame)
+        finally:
+            self._analyze_lock.release()
+        
+        if diff.has_changes:
+            self._publish(diff)
+        
+        return diff
+    
+    def _capture_frame(
+        self,
+        force_full: bool
+    ) -> tuple[CaptureResult, "Future[list[WindowInfo]]"]:
+        """Grab a frame (caller holds the capture lock)."""
         if force_full:
             self._capture.reset()
         
+        # Window enumeration doesn't depend on the frame, so it runs on the
+        # worker while this thread grabs and diffs (both sides are mostly
+        # native calls that release the GIL)
+        windows_future = self._windows_future
+        if (
+            windows_future is None
+            or self._window_events.consume()
+            or (windows_future.done() and windows_future.exception() is not None)
+        ):
+            if self._window_pool is None:
+                self._window_pool = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="window-enum"
+                )
+            windows_future = self._window_pool.submit(get_all_windows)
+            self._windows_future = windows_future
+        
         capture_result = self._capture.capture_incremental()
         self._last_capture_time = time.time()
         self._capture_count += 1
         
+        return capture_result, windows_future
+    
+    def _analyze_frame(
+        self,
+        capture_result: CaptureResult,
+        windows_future: "Future[list[WindowInfo]]"
+    ) -> VisualDiff:
+        """Detect elements in a captured frame (caller holds the analyze lock)."""
         # Get window information
-        windows = get_all_windows()
+        windows = windows_future.result()
         screen_size = get_screen_size()
         
         if capture_result.is_full_capture:
@@ -180,9 +274,6 @@ class DesktopVisualEngine:
         Returns:
             List of elements if a smart provider worked, None otherwise
         """
-        import logging
-        logger = logging.getLogger(__name__)
-        
         registry = self._get_provider_registry()
         if registry is None:
             return None
@@ -198,7 +289,9 @@ class DesktopVisualEngine:
             window_class = active_window.get("class_name", "")
             window_handle = active_window.get("handle")
             
-            logger.debug(f"Smart providers: process={process_name}, title={window_title[:30]}")
+            logger.debug(
+                "Smart providers: process=%s, title=%.30s", process_name, window_title
+            )
             
             # Find best provider for the ACTIVE window only
             # We should only use UIA when the active window matches
@@ -209,15 +302,22 @@ class DesktopVisualEngine:
             # The MCP should capture information from whatever window is active.
             
             if provider is None:
-                logger.debug(f"Smart providers: No provider matched for active window '{process_name}' - will use OCR")
+                logger.debug(
+                    "Smart providers: No provider matched for active window '%s' - will use OCR",
+                    process_name
+                )
                 return None
             
-            logger.debug(f"Smart providers: Using {provider.name}")
+            logger.debug("Smart providers: Using %s", provider.name)
             
             # Try to detect elements
             result = provider.detect(window_handle=window_handle)
             
-            logger.debug(f"Smart providers: success={result.success}, elements={len(result.elements)}, error={result.error}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Smart providers: success=%s, elements=%d, error=%s",
+                    result.success, len(result.elements), result.error
+                )
             
             # Use the provider result if successful (even if empty - we trust CDP/UIA over OCR)
             if result.success:
@@ -226,34 +326,21 @@ class DesktopVisualEngine:
             
         except Exception as e:
             # If anything fails, fall back to OCR
-            logger.warning(f"Smart providers error: {e}")
+            logger.warning("Smart providers error: %s", e)
         
         return None
     
     def _analyze_regions(self, capture: CaptureResult) -> list[UIElement]:
         """Analyze only the changed regions."""
-        all_elements: list[UIElement] = []
-        
-        for region in capture.dirty_regions:
-            # Extract region image
-            region_image = capture.get_region_image(region)
-            
-            # Detect elements in region
-            detection_result = self._detector.detect(
-                region_image,
-                region_offset=(region.bounds.x, region.bounds.y)
-            )
-            
-            all_elements.extend(detection_result.elements)
+        # Detect elements in all regions at once (one OCR run)
+        detection_result = self._detector.detect_batch(
+            [capture.get_region_image(region) for region in capture.dirty_regions],
+            [(region.bounds.x, region.bounds.y) for region in capture.dirty_regions],
+        )
+        all_elements = detection_result.elements
         
         # Merge with existing elements outside changed regions
-        for elem in self._cache.current_state.elements:
-            in_changed_region = any(
-                region.bounds.intersects(elem.bounds)
-                for region in capture.dirty_regions
-            )
-            if not in_changed_region:
-                all_elements.append(elem)
+        all_elements.extend(self._cache.get_elements_outside(capture.region_boxes))
         
         return all_elements
     
@@ -297,6 +384,22 @@ class DesktopVisualEngine:
         """Find an element by its label."""
         return self._cache.get_element_by_label(label, fuzzy=fuzzy)
     
+    def find_element_by_any_label(
+        self,
+        labels: Sequence[str]
+    ) -> Optional[tuple[str, UIElement]]:
+        """Find the first element matching any of the labels (in order)."""
+        return self._cache.get_element_by_any_label(labels)
+    
+    def find_elements_fuzzy(
+        self,
+        label: str,
+        threshold: int = 70,
+        limit: int = 50
+    ) -> list[UIElement]:
+        """Find the elements whose labels best match, best match first."""
+        return [elem for elem, _ in self._cache.query_elements_fuzzy(label, threshold, limit)]
+    
     def find_element_at(self, x: int, y: int) -> Optional[UIElement]:
         """Find the element at a specific position."""
         return self._cache.get_element_at(x, y)
@@ -553,6 +656,156 @@ class DesktopVisualEngine:
         
         return None
     
+    # ==================== Change Notification ====================
+    
+    def subscribe(self, maxsize: int = 100) -> "queue.Queue[VisualDiff]":
+        """
+        Subscribe to visual changes.
+        
+        Every diff with changes produced by capture_and_analyze() (from
+        any caller, including the monitor thread) is put on the returned
+        queue. Call start_monitoring() to have diffs produced in the
+        background instead of polling.
+        
+        Args:
+            maxsize: Queue capacity; diffs are dropped while it is full
+        
+        Returns:
+            Queue of VisualDiff objects
+        """
+        q: queue.Queue = queue.Queue(maxsize)
+        self._subscribers.append(q)
+        return q
+    
+    def unsubscribe(self, q: "queue.Queue[VisualDiff]") -> None:
+        """Stop delivering diffs to a queue returned by subscribe()."""
+        try:
+            self._subscribers.remove(q)
+        except ValueError:
+            pass
+    
+    def _publish(self, diff: VisualDiff) -> None:
+        """Deliver a diff to subscribers and wake up change waiters."""
+        for q in list(self._subscribers):
+            try:
+                q.put_nowait(diff)
+            except queue.Full:
+                logger.debug("Subscriber queue full, dropping diff")
+        
+        for event in list(self._change_waiters):
+            event.set()
+    
+    def start_monitoring(self, interval: float = 0.1, max_interval: float = 2.0) -> None:
+        """
+        Start capturing in a background thread.
+        
+        Capture and analysis run as a two-stage pipeline: the monitor
+        thread grabs frames and queues them to an analysis thread, so the
+        next grab overlaps the previous frame's OCR/detection. The capture
+        interval backs off while the screen is idle and resets after a
+        change. Diffs reach consumers via subscribe() and wait_for_change().
+        
+        Args:
+            interval: Initial capture interval in seconds
+            max_interval: Upper bound for the capture interval in seconds
+        """
+        if self._monitor_thread is not None:
+            return
+        
+        self._monitor_stop.clear()
+        
+        # At most two frames wait for analysis; beyond that the monitor
+        # thread blocks instead of piling up stale frames
+        pipeline: queue.Queue = queue.Queue(maxsize=2)
+        self._analyze_thread = threading.Thread(
+            target=self._analyze_loop,
+            args=(pipeline,),
+            name="desktop-visual-analyze",
+            daemon=True,
+        )
+        self._analyze_thread.start()
+        with self._capture_lock:
+            self._analyze_queue = pipeline
+        
+        self._monitor_thread = threading.Thread(
+            target=self._monitor_loop,
+            args=(interval, max_interval),
+            name="desktop-visual-monitor",
+            daemon=True,
+        )
+        self._monitor_thread.start()
+    
+    def stop_monitoring(self) -> None:
+        """Stop the background capture thread, if running."""
+        thread = self._monitor_thread
+        if thread is None:
+            return
+        
+        self._monitor_stop.set()
+        thread.join()
+        self._monitor_thread = None
+        
+        # Frames already queued are still analyzed before the worker exits
+        with self._capture_lock:
+            pipeline = self._analyze_queue
+            self._analyze_queue = None
+        pipeline.put(None)
+        self._analyze_thread.join()
+        self._analyze_thread = None
+    
+    def _monitor_loop(self, interval: float, max_interval: float) -> None:
+        """Capture stage of the monitoring pipeline (see start_monitoring())."""
+        sleep = interval
+        
+        while not self._monitor_stop.is_set():
+            try:
+                with self._capture_lock:
+                    frame = self._capture_frame(False)
+                    self._analyze_queue.put((frame, None))
+                capture_result = frame[0]
+                changed = capture_result.is_full_capture or capture_result.has_changes
+            except Exception as e:
+                logger.warning("Monitor capture failed: %s", e)
+                changed = False
+            
+            # Back off on pixel changes rather than the element diff, which
+            # is only known once the analysis thread gets to this frame
+            if changed:
+                sleep = interval
+            else:
+                sleep = min(sleep * _POLL_BACKOFF, max_interval)
+            
+            self._monitor_stop.wait(sleep)
+    
+    def _analyze_loop(self, pipeline: queue.Queue) -> None:
+        """
+        Analysis stage of the monitoring pipeline.
+        
+        Takes (frame, future) pairs in capture order until a None
+        sentinel. Frames queued by capture_and_analyze() carry a future
+        for the caller's diff; the monitor thread's frames carry None.
+        """
+        while True:
+            item = pipeline.get()
+            if item is None:
+                return
+            
+            frame, done = item
+            try:
+                with self._analyze_lock:
+                    diff = self._analyze_frame(*frame)
+            except Exception as e:
+                if done is not None:
+                    done.set_exception(e)
+                else:
+                    logger.warning("Monitor analysis failed: %s", e)
+                continue
+            
+            if diff.has_changes:
+                self._publish(diff)
+            if done is not None:
+                done.set_result(diff)
+    
     # ==================== Utility Methods ====================
     
     def refresh(self) -> VisualDiff:
@@ -563,52 +816,97 @@ class DesktopVisualEngine:
         self,
         label: str,
         timeout: float = 10.0,
-        interval: float = 0.5
+        interval: float = 0.5,
+        max_interval: float = 2.0
     ) -> Optional[UIElement]:
         """
         Wait for an element to appear.
         
+        While monitoring is active this re-checks the cache only when the
+        analysis thread publishes a change, without capturing itself.
+        Otherwise it polls with adaptive backoff: the check interval grows
+        while nothing changes on screen and resets after a change.
+        
         Args:
             label: Element label to wait for
             timeout: Maximum wait time in seconds
-            interval: Check interval in seconds
+            interval: Initial check interval in seconds
+            max_interval: Upper bound for the check interval in seconds
         
         Returns:
             The element if found, None if timeout
         """
-        start_time = time.time()
+        deadline = time.monotonic() + timeout
         
-        while time.time() - start_time < timeout:
-            self.capture_and_analyze()
+        if self._monitor_thread is not None:
+            # Register before the first check so a change published in
+            # between is not missed
+            event = threading.Event()
+            self._change_waiters.add(event)
+            try:
+                while True:
+                    elem = self._cache.get_element_by_label(label)
+                    if elem:
+                        return elem
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not event.wait(remaining):
+                        return None
+                    event.clear()
+            finally:
+                self._change_waiters.discard(event)
+        
+        sleep = interval
+        
+        while time.monotonic() < deadline:
+            diff = self.capture_and_analyze()
             elem = self._cache.get_element_by_label(label)
             if elem:
                 return elem
-            time.sleep(interval)
+            if diff.has_changes:
+                sleep = interval
+            time.sleep(max(0.0, min(sleep, deadline - time.monotonic())))
+            sleep = min(sleep * _POLL_BACKOFF, max_interval)
         
         return None
     
     def wait_for_change(
         self,
         timeout: float = 10.0,
-        interval: float = 0.5
+        interval: float = 0.5,
+        max_interval: float = 2.0
     ) -> bool:
         """
         Wait for any visual change.
         
+        While monitoring is active this blocks on an event set by the
+        monitor thread. Otherwise it polls, backing off the check
+        interval while the screen is idle.
+        
         Args:
             timeout: Maximum wait time in seconds
-            interval: Check interval in seconds
+            interval: Initial check interval in seconds
+            max_interval: Upper bound for the check interval in seconds
         
         Returns:
             True if change detected, False if timeout
         """
-        start_time = time.time()
+        if self._monitor_thread is not None:
+            event = threading.Event()
+            self._change_waiters.add(event)
+            try:
+                return event.wait(timeout)
+            finally:
+                self._change_waiters.discard(event)
+        
+        deadline = time.monotonic() + timeout
+        sleep = interval
         
-        while time.time() - start_time < timeout:
+        while time.monotonic() < deadline:
             diff = self.capture_and_analyze()
             if diff.has_changes:
                 return True
-            time.sleep(interval)
+            time.sleep(max(0.0, min(sleep, deadline - time.monotonic())))
+            sleep = min(sleep * _POLL_BACKOFF, max_interval)
         
         return False
     
@@ -616,6 +914,7 @@ class DesktopVisualEngine:
         """Get engine statistics."""
         return {
             "is_running": self._is_running,
+            "is_monitoring": self._monitor_thread is not None,
             "capture_count": self._capture_count,
             "last_capture_time": self._last_capture_time,
             "ocr_available": self._ocr.is_available,
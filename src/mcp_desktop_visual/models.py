@@ -6,9 +6,27 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Optional
 from datetime import datetime
+import sys
 import uuid
 
 
+# Labels/text up to this length are interned (see _intern_text)
+_INTERN_MAX_LEN = 64
+
+
+def _intern_text(value: Optional[str]) -> Optional[str]:
+    """
+    Intern short label/text strings.
+    
+    UIs repeat the same strings a lot (table rows, "OK", menu items),
+    so sharing one object makes equality checks in diffs pointer
+    compares and keeps the heap smaller. Long strings are left alone.
+    """
+    if value and len(value) <= _INTERN_MAX_LEN:
+        return sys.intern(value)
+    return value
+
+
 class ElementType(str, Enum):
     """Types of UI elements that can be detected."""
     
@@ -56,7 +74,7 @@ class ChangeType(str, Enum):
     MOVED = "moved"
 
 
-@dataclass
+@dataclass(slots=True)
 class BoundingBox:
     """Represents a rectangular region on screen."""
     
@@ -91,11 +109,12 @@ class BoundingBox:
     
     def intersects(self, other: "BoundingBox") -> bool:
         """Check if this bounding box intersects with another."""
+        x, y, ox, oy = self.x, self.y, other.x, other.y
         return not (
-            self.x2 < other.x or
-            other.x2 < self.x or
-            self.y2 < other.y or
-            other.y2 < self.y
+            x + self.width < ox or
+            ox + other.width < x or
+            y + self.height < oy or
+            oy + other.height < y
         )
     
     def intersection(self, other: "BoundingBox") -> Optional["BoundingBox"]:
@@ -112,10 +131,13 @@ class BoundingBox:
     
     def union(self, other: "BoundingBox") -> "BoundingBox":
         """Get the union (smallest enclosing box) of two bounding boxes."""
-        x = min(self.x, other.x)
-        y = min(self.y, other.y)
-        x2 = max(self.x2, other.x2)
-        y2 = max(self.y2, other.y2)
+        sx, sy, ox, oy = self.x, self.y, other.x, other.y
+        x = sx if sx < ox else ox
+        y = sy if sy < oy else oy
+        sx2, ox2 = sx + self.width, ox + other.width
+        sy2, oy2 = sy + self.height, oy + other.height
+        x2 = sx2 if sx2 > ox2 else ox2
+        y2 = sy2 if sy2 > oy2 else oy2
         
         return BoundingBox(x, y, x2 - x, y2 - y)
     
@@ -207,8 +229,8 @@ class UIElement:
             id=cls._generate_stable_id(type, bounds, label, text),
             type=type,
             bounds=bounds,
-            label=label,
-            text=text,
+            label=_intern_text(label),
+            text=_intern_text(text),
             **kwargs
         )
     
@@ -360,11 +382,17 @@ class ScreenState:
     
     def get_element_at(self, x: int, y: int) -> Optional[UIElement]:
         """Find element at position."""
-        # Return the smallest element containing the point
-        matching = [e for e in self.elements if e.bounds.contains(x, y)]
-        if not matching:
-            return None
-        return min(matching, key=lambda e: e.bounds.area)
+        # Return the smallest element containing the point, in one pass
+        best = None
+        best_area = 0
+        for elem in self.elements:
+            b = elem.bounds
+            if b.x <= x <= b.x + b.width and b.y <= y <= b.y + b.height:
+                area = b.width * b.height
+                if best is None or area < best_area:
+                    best = elem
+                    best_area = area
+        return best
     
     def to_dict(self) -> dict:
         """Convert to dictionary."""
@@ -108,6 +108,12 @@ class OCREngine:
         """Check if OCR is available."""
         return self._tesseract_available
     
+    def _tessdata_args(self) -> list[str]:
+        """Extra Tesseract arguments selecting config.tessdata_dir, if set."""
+        if self.config.tessdata_dir:
+            return ['--tessdata-dir', self.config.tessdata_dir]
+        return []
+    
     def preprocess(self, image: np.ndarray, fast_mode: bool = False) -> np.ndarray:
         """
         Preprocess image for better OCR accuracy.
@@ -195,6 +201,7 @@ class OCREngine:
                         '--psm', str(self.config.psm),
                         '-l', self.config.language,
                         '--oem', '3',
+                        *self._tessdata_args(),
                         '-c', 'tessedit_create_tsv=1'
                     ],
                     capture_output=True,
@@ -291,7 +298,8 @@ class OCREngine:
                         'stdout',
                         '--psm', str(psm),
                         '-l', self.config.language,
-                        '--oem', '3'
+                        '--oem', '3',
+                        *self._tessdata_args(),
                     ],
                     capture_output=True,
                     timeout=15,
@@ -4,12 +4,14 @@ MCP Desktop Visual Server
 Main MCP server implementation that exposes desktop visual tools.
 """
 
+from __future__ import annotations
+
 import asyncio
-import json
 import logging
 import sys
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
+import orjson
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import (
@@ -18,11 +20,15 @@ from mcp.types import (
     CallToolResult,
 )
 
-from .engine import DesktopVisualEngine, get_engine, start_engine
 from .models import ElementType, UIElement, ScreenState, VisualDiff
 from .config import get_config
 from .browser_bridge import BrowserBridge
 
+if TYPE_CHECKING:
+    # The engine pulls in OpenCV, NumPy and the OCR stack; it is imported
+    # on first use so the server can answer the MCP handshake right away
+    from .engine import DesktopVisualEngine
+
 
 # Configure logging
 logging.basicConfig(
@@ -179,6 +185,8 @@ def get_or_start_engine() -> DesktopVisualEngine:
     """Get or start the desktop visual engine."""
     global _engine
     if _engine is None:
+        from .engine import DesktopVisualEngine
+        
         _engine = DesktopVisualEngine()
         _engine.start()
         logger.info("Desktop Visual Engine started")
@@ -807,6 +815,31 @@ Params depend on method (e.g. click/type/query use {selector: "..."}).""",
             "required": ["method"],
         },
     ),
+    Tool(
+        name="browser_batch",
+        description="""Send several commands to the browser extension in a single round-trip.
+
+The commands run in order on the active tab (e.g. fill several fields, then click submit).
+Each op is {method, params} using the same methods as browser_command.""",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "ops": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "method": {"type": "string"},
+                            "params": {"type": "object"},
+                        },
+                        "required": ["method"],
+                    },
+                },
+                "timeout": {"type": "number", "default": 10.0},
+            },
+            "required": ["ops"],
+        },
+    ),
 
     # Browser Extension Convenience Tools (preferred)
     Tool(
@@ -981,18 +1014,28 @@ async def list_tools() -> list[Tool]:
     return TOOLS
 
 
+# Tool results are plain dicts from the to_dict() methods, but may carry
+# NumPy scalars or tuples; anything else falls back to str()
+_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _to_json(obj: Any) -> str:
+    """Serialize a tool result for a TextContent reply."""
+    return orjson.dumps(obj, default=str, option=_JSON_OPTIONS).decode()
+
+
 @app.call_tool()
 async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
     """Handle tool calls."""
     try:
         engine = get_or_start_engine()
         result = await _handle_tool(engine, name, arguments)
-        return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
+        return [TextContent(type="text", text=_to_json(result))]
     except Exception as e:
-        logger.exception(f"Error handling tool {name}")
+        logger.exception("Error handling tool %s", name)
         return [TextContent(
             type="text",
-            text=json.dumps({"error": str(e), "tool": name}, indent=2),
+            text=_to_json({"error": str(e), "tool": name}),
         )]
 
 
@@ -1291,6 +1334,12 @@ async def _handle_tool(
         timeout = float(args.get("timeout", 10.0))
         return await bridge.command(method=method, params=params, timeout=timeout)
 
+    elif name == "browser_batch":
+        bridge = await get_or_start_browser_bridge()
+        timeout = float(args.get("timeout", 10.0))
+        results = await bridge.command_many(args.get("ops") or [], timeout=timeout)
+        return {"ok": all(r.get("ok") for r in results), "results": results}
+
     elif name == "browser_get_state":
         bridge = await get_or_start_browser_bridge()
         timeout = float(args.get("timeout", 10.0))
@@ -1463,7 +1512,7 @@ def main():
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
     except Exception as e:
-        logger.exception(f"Server error: {e}")
+        logger.exception("Server error: %s", e)
         sys.exit(1)
 
 
@@ -0,0 +1,238 @@
+"""
+Spatial indexing for UI elements.
+
+Provides a point-region quadtree over element bounding boxes so that
+hit-testing only touches elements near the query point instead of
+scanning the whole cache.
+"""
+
+import heapq
+from typing import Optional, Sequence
+
+from .models import BoundingBox
+
+
+def overlap_groups(boxes: Sequence[BoundingBox]) -> list[list[int]]:
+    """
+    Group boxes into connected components of overlap.
+
+    Two boxes are connected when they intersect (touching edges count,
+    as in BoundingBox.intersects); groups are transitive. Uses a
+    top-to-bottom sweep that only compares each box against boxes still
+    active at its top edge, plus union-find to join the groups.
+
+    Args:
+        boxes: Boxes to group
+
+    Returns:
+        Lists of indices into boxes, one per group, ordered by each
+        group's first index
+    """
+    parent = list(range(len(boxes)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    order = sorted(range(len(boxes)), key=lambda i: boxes[i].y)
+    active: list[tuple[int, int]] = []  # heap of (y2, index)
+
+    for i in order:
+        b = boxes[i]
+        # Drop boxes that end above this one's top edge
+        while active and active[0][0] < b.y:
+            heapq.heappop(active)
+
+        bx, bx2 = b.x, b.x + b.width
+        for _, j in active:
+            o = boxes[j]
+            if not (o.x + o.width < bx or bx2 < o.x):
+                ri, rj = find(i), find(j)
+                if ri != rj:
+                    parent[max(ri, rj)] = min(ri, rj)
+
+        heapq.heappush(active, (b.y2, i))
+
+    groups: dict[int, list[int]] = {}
+    for i in range(len(boxes)):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+
+class _QuadNode:
+    """A single node of the quadtree."""
+
+    __slots__ = ("bounds", "depth", "items", "children", "owner")
+
+    def __init__(self, bounds: BoundingBox, depth: int, owner: object):
+        self.bounds = bounds
+        self.depth = depth
+        self.items: dict[str, BoundingBox] = {}
+        self.children: Optional[list["_QuadNode"]] = None
+        # Token of the tree allowed to edit this node in place
+        self.owner = owner
+
+    def child_index(self, bounds: BoundingBox) -> Optional[int]:
+        """Return the index of the child quadrant that fully contains bounds, if any."""
+        if self.children is None:
+            return None
+        for i, child in enumerate(self.children):
+            cb = child.bounds
+            if (cb.x <= bounds.x and bounds.x2 <= cb.x2 and
+                cb.y <= bounds.y and bounds.y2 <= cb.y2):
+                return i
+        return None
+
+
+class QuadTree:
+    """
+    Point-region quadtree keyed by item ID.
+
+    Each item lives in the deepest node whose quadrant fully contains
+    its bounding box. Items straddling a split line (or lying outside
+    the root bounds) stay in the parent node, so queries never miss them.
+    Items are numbered in insertion order (re-inserting renumbers), which
+    breaks ties between equal-area matches.
+
+    copy() is O(1) in the nodes: both trees share them, and a write
+    copies the nodes on its path first, so neither tree ever sees the
+    other's edits.
+    """
+
+    def __init__(
+        self,
+        bounds: BoundingBox,
+        max_items: int = 10,
+        max_depth: int = 8
+    ):
+        self.max_items = max_items
+        self.max_depth = max_depth
+        self._owner = object()
+        self._root = _QuadNode(bounds, 0, self._owner)
+        # ID -> (bounds, insertion number)
+        self._items: dict[str, tuple[BoundingBox, int]] = {}
+        self._inserted = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def copy(self) -> "QuadTree":
+        """Return a copy that shares this tree's nodes until either is written."""
+        new = QuadTree.__new__(QuadTree)
+        new.max_items = self.max_items
+        new.max_depth = self.max_depth
+        new._root = self._root
+        new._items = self._items.copy()
+        new._inserted = self._inserted
+        # Fresh tokens on both sides: every existing node is now shared
+        new._owner = object()
+        self._owner = object()
+        return new
+
+    def insert(self, item_id: str, bounds: BoundingBox) -> None:
+        """Insert (or move) an item."""
+        if item_id in self._items:
+            self.remove(item_id)
+
+        node = self._root = self._own(self._root)
+        while True:
+            if node.children is None:
+                if len(node.items) < self.max_items or node.depth >= self.max_depth:
+                    break
+                self._split(node)
+
+            i = node.child_index(bounds)
+            if i is None:
+                break
+            child = node.children[i] = self._own(node.children[i])
+            node = child
+
+        node.items[item_id] = bounds
+        self._items[item_id] = (bounds, self._inserted)
+        self._inserted += 1
+
+    def remove(self, item_id: str) -> None:
+        """Remove an item. Unknown IDs are ignored."""
+        entry = self._items.pop(item_id, None)
+        if entry is None:
+            return
+        bounds = entry[0]
+
+        # An item sits on the path insert would take for its bounds, in
+        # the first node on that path that holds it
+        node = self._root = self._own(self._root)
+        while item_id not in node.items:
+            i = node.child_index(bounds)
+            child = node.children[i] = self._own(node.children[i])
+            node = child
+        del node.items[item_id]
+
+    def query_point_smallest(self, x: int, y: int) -> Optional[str]:
+        """
+        Get the ID of the smallest-area item containing the point.
+
+        Tracks the best match during the walk instead of collecting every
+        item that contains the point. Among equal areas the earliest
+        inserted item wins, whatever order the walk visits them in.
+        """
+        best_id: Optional[str] = None
+        best_area = 0
+        items = self._items
+        stack = [self._root]
+
+        while stack:
+            node = stack.pop()
+            for item_id, b in node.items.items():
+                if b.x <= x <= b.x2 and b.y <= y <= b.y2:
+                    area = b.width * b.height
+                    if (
+                        best_id is None or area < best_area
+                        or (area == best_area and items[item_id][1] < items[best_id][1])
+                    ):
+                        best_id = item_id
+                        best_area = area
+
+            if node.children is not None:
+                for child in node.children:
+                    if child.bounds.contains(x, y):
+                        stack.append(child)
+
+        return best_id
+
+    def _own(self, node: _QuadNode) -> _QuadNode:
+        """Return node if this tree may edit it, else a copy it may edit."""
+        if node.owner is self._owner:
+            return node
+        clone = _QuadNode(node.bounds, node.depth, self._owner)
+        clone.items = node.items.copy()
+        if node.children is not None:
+            clone.children = list(node.children)
+        return clone
+
+    def _split(self, node: _QuadNode) -> None:
+        """Split a leaf into four quadrants and push its items down."""
+        b = node.bounds
+        half_w = b.width // 2
+        half_h = b.height // 2
+        depth = node.depth + 1
+        owner = self._owner
+
+        node.children = [
+            _QuadNode(BoundingBox(b.x, b.y, half_w, half_h), depth, owner),
+            _QuadNode(BoundingBox(b.x + half_w, b.y, b.width - half_w, half_h), depth, owner),
+            _QuadNode(BoundingBox(b.x, b.y + half_h, half_w, b.height - half_h), depth, owner),
+            _QuadNode(
+                BoundingBox(b.x + half_w, b.y + half_h, b.width - half_w, b.height - half_h),
+                depth,
+                owner,
+            ),
+        ]
+
+        items = node.items
+        node.items = {}
+        for item_id, item_bounds in items.items():
+            i = node.child_index(item_bounds)
+            target = node if i is None else node.children[i]
+            target.items[item_id] = item_bounds
@@ -8,16 +8,22 @@ and interact with the Windows UI.
 from dataclasses import dataclass
 from typing import Optional, Callable
 import ctypes
+import logging
+import threading
 from ctypes import wintypes
 
 from .models import BoundingBox, WindowInfo
 
 
+logger = logging.getLogger(__name__)
+
+
 # Windows API constants
 GW_OWNER = 4
 GWL_EXSTYLE = -20
 WS_EX_TOOLWINDOW = 0x00000080
 WS_EX_APPWINDOW = 0x00040000
+GA_ROOT = 2
 GA_ROOTOWNER = 3
 
 SW_HIDE = 0
@@ -25,6 +31,25 @@ SW_MINIMIZE = 6
 SW_MAXIMIZE = 3
 SW_RESTORE = 9
 
+WM_QUIT = 0x0012
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_SYSTEM_MINIMIZEEND = 0x0017
+EVENT_OBJECT_CREATE = 0x8000
+EVENT_OBJECT_DESTROY = 0x8001
+EVENT_OBJECT_LOCATIONCHANGE = 0x800B
+EVENT_OBJECT_NAMECHANGE = 0x800C
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+
+# Event ranges that can change what get_all_windows() returns: foreground
+# through minimize/restore, and create/destroy/show/hide/move/rename
+_WINDOW_EVENT_RANGES = (
+    (EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_MINIMIZEEND),
+    (EVENT_OBJECT_CREATE, EVENT_OBJECT_NAMECHANGE),
+)
+
 
 # Load Windows DLLs
 user32 = ctypes.windll.user32
@@ -34,6 +59,18 @@ psapi = ctypes.windll.psapi
 
 # Type definitions
 WNDENUMPROC = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+WINEVENTPROC = ctypes.WINFUNCTYPE(
+    None,
+    wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+    wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD,
+)
+
+user32.SetWinEventHook.restype = wintypes.HANDLE
+user32.SetWinEventHook.argtypes = (
+    wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, WINEVENTPROC,
+    wintypes.DWORD, wintypes.DWORD, wintypes.DWORD,
+)
+user32.UnhookWinEvent.argtypes = (wintypes.HANDLE,)
 
 
 def get_window_title(hwnd: int) -> str:
@@ -333,3 +370,112 @@ def get_active_window_info() -> Optional[dict]:
         "process_id": get_process_id(hwnd),
         "bounds": bounds,
     }
+
+
+class WindowEventWatcher:
+    """
+    Tracks whether the top-level window list may have changed.
+    
+    Installs out-of-context WinEvent hooks (foreground, minimize/restore,
+    create/destroy/show/hide, move/resize, title change) on a dedicated
+    thread running a message loop, and raises a flag when one fires.
+    Callers re-enumerate windows only after consume() reports a change.
+    If the hooks can't be installed, consume() always returns True.
+    """
+    
+    def __init__(self):
+        self._changed = threading.Event()
+        self._changed.set()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id = 0
+        # The hook calls back through this; it must outlive the hooks
+        self._proc = WINEVENTPROC(self._on_event)
+    
+    def start(self) -> bool:
+        """Install the hooks. Returns False if they could not be installed."""
+        if self._thread is not None:
+            return self._running
+        
+        ready = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(ready,),
+            name="window-events",
+            daemon=True,
+        )
+        self._thread.start()
+        ready.wait()
+        return self._running
+    
+    def stop(self) -> None:
+        """Remove the hooks and stop the message loop thread."""
+        thread = self._thread
+        if thread is None:
+            return
+        
+        if self._running:
+            user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+        thread.join()
+        self._thread = None
+    
+    def consume(self) -> bool:
+        """Check (and clear) whether windows may have changed since the last call."""
+        if not self._running:
+            return True
+        if not self._changed.is_set():
+            return False
+        self._changed.clear()
+        return True
+    
+    def _on_event(
+        self,
+        hook: int,
+        event: int,
+        hwnd: int,
+        id_object: int,
+        id_child: int,
+        thread_id: int,
+        time_ms: int
+    ) -> None:
+        """WinEvent callback, run on the message loop thread."""
+        if id_object != OBJID_WINDOW or id_child != CHILDID_SELF or not hwnd:
+            return
+        
+        # Location changes also fire for every child control that moves;
+        # only top-level windows matter here
+        if event == EVENT_OBJECT_LOCATIONCHANGE and user32.GetAncestor(hwnd, GA_ROOT) != hwnd:
+            return
+        
+        self._changed.set()
+    
+    def _run(self, ready: threading.Event) -> None:
+        """Message loop thread: hooks must be serviced by the thread that installed them."""
+        self._thread_id = kernel32.GetCurrentThreadId()
+        flags = WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS
+        hooks = [
+            user32.SetWinEventHook(low, high, None, self._proc, 0, 0, flags)
+            for low, high in _WINDOW_EVENT_RANGES
+        ]
+        
+        if not all(hooks):
+            logger.warning("SetWinEventHook failed; window list will be re-read every frame")
+            for hook in hooks:
+                if hook:
+                    user32.UnhookWinEvent(hook)
+            ready.set()
+            return
+        
+        self._running = True
+        ready.set()
+        
+        try:
+            msg = wintypes.MSG()
+            while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            self._running = False
+            self._changed.set()
+            for hook in hooks:
+                user32.UnhookWinEvent(hook)
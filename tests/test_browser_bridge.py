@@ -0,0 +1,179 @@
+"""Tests for batched commands and client tracking in the browser bridge."""
+
+import asyncio
+from typing import Any, Optional
+
+import orjson
+
+from mcp_desktop_visual.browser_bridge import BrowserBridge
+
+
+class _FakeWebSocket:
+    """Stands in for an extension connection."""
+    
+    def __init__(self, fail_send: bool = False):
+        self.fail_send = fail_send
+        # Frames the bridge sent, decoded
+        self.outbox: asyncio.Queue = asyncio.Queue()
+        self._inbox: asyncio.Queue = asyncio.Queue()
+    
+    async def send(self, frame: str) -> None:
+        if self.fail_send:
+            raise ConnectionError("connection lost")
+        self.outbox.put_nowait(orjson.loads(frame))
+    
+    def receive(self, msg: Optional[dict[str, Any]]) -> None:
+        """Queue a message from the extension (None closes the connection)."""
+        self._inbox.put_nowait(None if msg is None else orjson.dumps(msg).decode())
+    
+    def __aiter__(self) -> "_FakeWebSocket":
+        return self
+    
+    async def __anext__(self) -> str:
+        message = await self._inbox.get()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+
+async def _connect(bridge: BrowserBridge, ws: _FakeWebSocket) -> asyncio.Task:
+    handler = asyncio.create_task(bridge._handler(ws))
+    await asyncio.sleep(0)
+    assert ws in bridge._clients
+    return handler
+
+
+async def _disconnect(ws: _FakeWebSocket, handler: asyncio.Task) -> None:
+    ws.receive(None)
+    await asyncio.wait_for(handler, 5)
+
+
+def test_batch_response_resolves_every_sub_command():
+    async def scenario():
+        bridge = BrowserBridge()
+        ws = _FakeWebSocket()
+        handler = await _connect(bridge, ws)
+        
+        call = asyncio.create_task(bridge.command_many([
+            {"method": "get_state"},
+            {"method": "click", "params": {"selector": "#go"}},
+        ]))
+        frame = await asyncio.wait_for(ws.outbox.get(), 5)
+        
+        assert frame["method"] == "batch"
+        ops = frame["params"]["ops"]
+        assert [op["method"] for op in ops] == ["get_state", "click"]
+        assert [op["params"] for op in ops] == [{}, {"selector": "#go"}]
+        sub_ids = [op["id"] for op in ops]
+        assert len({frame["id"], *sub_ids}) == 3
+        assert set(bridge._pending) == set(sub_ids)
+        
+        # Answered out of order; malformed entries and unknown IDs are skipped
+        ws.receive({
+            "type": "batch_response",
+            "id": frame["id"],
+            "responses": [
+                {"id": sub_ids[1], "ok": True, "result": "clicked"},
+                "junk",
+                {"ok": True},
+                {"id": 10**9, "ok": True},
+                {"id": sub_ids[0], "ok": False, "error": "no tab"},
+            ],
+        })
+        results = await asyncio.wait_for(call, 5)
+        
+        assert not bridge._pending
+        await _disconnect(ws, handler)
+        assert not bridge._clients
+        return results
+    
+    assert asyncio.run(scenario()) == [
+        {"ok": False, "result": None, "error": "no tab"},
+        {"ok": True, "result": "clicked", "error": None},
+    ]
+
+
+def test_batch_timeout_reports_only_missing_results():
+    async def scenario():
+        bridge = BrowserBridge()
+        ws = _FakeWebSocket()
+        handler = await _connect(bridge, ws)
+        
+        call = asyncio.create_task(bridge.command_many(
+            [{"method": "get_state"}, {"method": "navigate", "params": {"url": "about:blank"}}],
+            timeout=0.1,
+        ))
+        frame = await asyncio.wait_for(ws.outbox.get(), 5)
+        first_id = frame["params"]["ops"][0]["id"]
+        ws.receive({
+            "type": "batch_response",
+            "id": frame["id"],
+            "responses": [{"id": first_id, "ok": True, "result": {"url": "x"}}],
+        })
+        results = await asyncio.wait_for(call, 5)
+        
+        # The late sub-command is no longer pending, so a late answer is dropped
+        assert not bridge._pending
+        ws.receive({
+            "type": "batch_response",
+            "id": frame["id"],
+            "responses": [{"id": frame["params"]["ops"][1]["id"], "ok": True}],
+        })
+        await _disconnect(ws, handler)
+        return results
+    
+    assert asyncio.run(scenario()) == [
+        {"ok": True, "result": {"url": "x"}, "error": None},
+        {"ok": False, "error": "Timeout waiting for extension response"},
+    ]
+
+
+def test_batch_send_error_cleans_up_pending_futures():
+    async def scenario():
+        bridge = BrowserBridge()
+        ws = _FakeWebSocket(fail_send=True)
+        handler = await _connect(bridge, ws)
+        
+        results = await bridge.command_many([{"method": "get_state"}, {"method": "query"}])
+        
+        assert not bridge._pending
+        await _disconnect(ws, handler)
+        return results
+    
+    assert asyncio.run(scenario()) == [{"ok": False, "error": "connection lost"}] * 2
+
+
+def test_batch_without_client_or_ops():
+    async def scenario():
+        bridge = BrowserBridge()
+        return (
+            await bridge.command_many([]),
+            await bridge.command_many([{"method": "get_state"}]),
+        )
+    
+    empty, no_client = asyncio.run(scenario())
+    assert empty == []
+    assert no_client == [{"ok": False, "error": "No extension clients connected"}]
+
+
+def test_disconnect_falls_back_to_most_recently_seen_client():
+    async def scenario():
+        bridge = BrowserBridge()
+        sockets = [_FakeWebSocket() for _ in range(3)]
+        handlers = [await _connect(bridge, ws) for ws in sockets]
+        first, second, last = sockets
+        assert bridge._mru_ws is last
+        
+        # The first-connected client is not the most recently seen one
+        bridge._clients[first].last_seen = 1.0
+        bridge._clients[second].last_seen = 3.0
+        bridge._clients[last].last_seen = 2.0
+        
+        await _disconnect(last, handlers[2])
+        assert bridge._mru_ws is second
+        await _disconnect(second, handlers[1])
+        assert bridge._mru_ws is first
+        await _disconnect(first, handlers[0])
+        assert bridge._mru_ws is None
+    
+    asyncio.run(scenario())
@@ -0,0 +1,109 @@
+"""Tests for the visual state cache."""
+
+from datetime import datetime
+
+from mcp_desktop_visual.cache import VisualStateCache
+from mcp_desktop_visual.config import CacheConfig
+from mcp_desktop_visual.models import BoundingBox, ElementType, ScreenState, UIElement
+
+
+def _elements(start: int, count: int) -> list[UIElement]:
+    return [
+        UIElement(
+            id=f"e{i}",
+            type=ElementType.TEXT,
+            bounds=BoundingBox(i % 100 * 10, i // 100 * 10, 8, 8),
+            label=f"item {i}",
+        )
+        for i in range(start, start + count)
+    ]
+
+
+def _cache(max_elements: int) -> VisualStateCache:
+    return VisualStateCache(CacheConfig(max_elements=max_elements, validate_indexes=True))
+
+
+def test_update_full_keeps_newest_elements():
+    cache = _cache(100)
+    
+    cache.update_full(ScreenState(timestamp=datetime.now(), elements=_elements(0, 150)))
+    
+    ids = [e.id for e in cache.current_state.elements]
+    assert ids == [f"e{i}" for i in range(50, 150)]
+
+
+def test_update_incremental_never_evicts_its_own_elements():
+    cache = _cache(100)
+    cache.update_full(ScreenState(timestamp=datetime.now(), elements=_elements(0, 49)))
+    
+    cache.update_incremental(added=_elements(49, 60), removed=[], modified=[])
+    
+    ids = {e.id for e in cache.current_state.elements}
+    assert len(ids) <= 100
+    assert {f"e{i}" for i in range(49, 109)} <= ids
+
+
+def test_update_incremental_larger_than_cache_keeps_newest():
+    cache = _cache(100)
+    cache.update_full(ScreenState(timestamp=datetime.now(), elements=_elements(0, 10)))
+    
+    cache.update_incremental(added=_elements(10, 150), removed=[], modified=[])
+    
+    ids = [e.id for e in cache.current_state.elements]
+    assert ids == [f"e{i}" for i in range(60, 160)]
+
+
+def test_lookups_do_not_reorder_queries():
+    cache = _cache(1000)
+    cache.update_full(ScreenState(timestamp=datetime.now(), elements=_elements(0, 20)))
+    before = [e.id for e in cache.query_elements(label="item", limit=5)]
+    
+    cache.get_element_by_label("item 3")
+    cache.get_element_by_id("e1")
+    
+    assert [e.id for e in cache.query_elements(label="item", limit=5)] == before
+    assert [e.id for e in cache.current_state.elements] == [f"e{i}" for i in range(20)]
+
+
+def test_eviction_spares_recently_used_elements():
+    cache = _cache(100)
+    cache.update_full(ScreenState(timestamp=datetime.now(), elements=_elements(0, 100)))
+    
+    cache.get_element_by_id("e0")
+    cache.update_incremental(added=_elements(100, 1), removed=[], modified=[])
+    
+    ids = {e.id for e in cache.current_state.elements}
+    assert "e0" in ids and "e100" in ids
+    assert "e1" not in ids
+
+
+def test_update_incremental_leaves_published_snapshot_untouched():
+    cache = _cache(1000)
+    cache.update_full(ScreenState(timestamp=datetime.now(), elements=_elements(0, 300)))
+    old = cache._snap
+    old_ids = list(old.elements)
+    old_labels = {key: list(bucket) for key, bucket in old.by_label.items()}
+    old_types = {key: list(bucket) for key, bucket in old.by_type.items()}
+    old_hits = [old.spatial.query_point_smallest(x, 5) for x in range(0, 1000, 7)]
+    
+    moved = UIElement(
+        id="e5", type=ElementType.BUTTON, bounds=BoundingBox(500, 500, 30, 30), label="moved"
+    )
+    cache.update_incremental(
+        added=_elements(300, 20), removed=["e0", "e1", "e2"], modified=[moved]
+    )
+    
+    # Readers still holding the old snapshot see it exactly as published
+    assert cache._snap is not old
+    assert list(old.elements) == old_ids
+    assert {key: list(bucket) for key, bucket in old.by_label.items()} == old_labels
+    assert {key: list(bucket) for key, bucket in old.by_type.items()} == old_types
+    assert [old.spatial.query_point_smallest(x, 5) for x in range(0, 1000, 7)] == old_hits
+    
+    # History shares the old table rather than copying it
+    assert cache._history[0].elements is old.elements
+    
+    assert cache.get_element_by_id("e0") is None
+    assert cache.get_element_by_label("moved").id == "e5"
+    assert cache.get_element_at(510, 510).id == "e5"
+    assert len(cache.current_state.elements) == 317
@@ -0,0 +1,52 @@
+"""Tests for dirty-region merging in the capture module."""
+
+import time
+
+import numpy as np
+
+from mcp_desktop_visual.capture import ScreenCapture
+
+
+def _boxes(x: np.ndarray, y: np.ndarray, w: int, h: int) -> np.ndarray:
+    return np.stack([x, y, x + w, y + h], axis=1).astype(np.int32)
+
+
+def test_merge_boxes_groups_nearby_boxes():
+    boxes = np.array([
+        [0, 0, 10, 10],
+        [25, 0, 35, 10],      # 15px from the first: merged
+        [100, 100, 110, 110], # far from both: kept apart
+    ], dtype=np.int32)
+    scores = np.array([0.1, 0.5, 0.2])
+    
+    merged, merged_scores = ScreenCapture._merge_boxes(boxes, scores)
+    
+    assert merged.tolist() == [[0, 0, 35, 10], [100, 100, 110, 110]]
+    assert merged_scores.tolist() == [0.5, 0.2]
+
+
+def test_merge_boxes_long_chain():
+    # Each box only touches the next one, so the whole staircase is one
+    # group reachable only through a 3000-step chain
+    i = np.arange(3000)
+    boxes = _boxes(i * 15, i * 15, 10, 10)
+    scores = np.linspace(0.0, 1.0, len(boxes))
+    
+    start = time.perf_counter()
+    merged, merged_scores = ScreenCapture._merge_boxes(boxes, scores)
+    elapsed = time.perf_counter() - start
+    
+    assert merged.tolist() == [[0, 0, 2999 * 15 + 10, 2999 * 15 + 10]]
+    assert merged_scores.tolist() == [1.0]
+    assert elapsed < 2.0
+
+
+def test_merge_boxes_keeps_separate_rows():
+    # Two rows of chained boxes, 50px apart: two groups, in first-member order
+    i = np.arange(500)
+    boxes = np.concatenate([_boxes(i * 25, 0 * i, 10, 10), _boxes(i * 25, 0 * i + 60, 10, 10)])
+    scores = np.zeros(len(boxes))
+    
+    merged, _ = ScreenCapture._merge_boxes(boxes, scores)
+    
+    assert merged.tolist() == [[0, 0, 499 * 25 + 10, 10], [0, 60, 499 * 25 + 10, 70]]
@@ -0,0 +1,146 @@
+"""Tests for batched OCR and overlap filtering in the element detector."""
+
+import random
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+
+from mcp_desktop_visual.config import ElementDetectionConfig, OCRConfig
+from mcp_desktop_visual.detector import _NMS_CELL, ElementDetector
+from mcp_desktop_visual.models import BoundingBox, ElementType, UIElement
+from mcp_desktop_visual.ocr import OCREngine, WordResult
+
+
+class _ThresholdOCR:
+    """
+    OCR stand-in that binarizes against the image's dominant colour.
+    
+    Like a global threshold, it reads as ink every pixel far from the
+    median, so a tile placed on a background of the wrong polarity turns
+    into one solid blob instead of its words.
+    """
+    
+    def extract_text(self, image: np.ndarray) -> SimpleNamespace:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        ink = (np.abs(gray.astype(np.int16) - int(np.median(gray))) > 80).astype(np.uint8)
+        ink = cv2.dilate(ink, np.ones((1, 9), np.uint8))
+        count, _, stats, _ = cv2.connectedComponentsWithStats(ink)
+        words = [
+            WordResult(f"w{w}x{h}", 90.0, BoundingBox(int(x), int(y), int(w), int(h)))
+            for x, y, w, h, _ in stats[1:]
+        ]
+        return SimpleNamespace(words=words)
+
+
+def _tile(text: str, dark: bool) -> np.ndarray:
+    background, ink = (30, 230) if dark else (240, 20)
+    image = np.full((48, 360, 3), background, dtype=np.uint8)
+    cv2.putText(image, text, (10, 34), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (ink,) * 3, 2)
+    return image
+
+
+def _words(elements, with_bounds: bool = True) -> list[tuple]:
+    if with_bounds:
+        return sorted((e.label, e.bounds.to_tuple()) for e in elements)
+    return sorted((e.label,) for e in elements)
+
+
+def _batch_matches_single(ocr, tiles: list[np.ndarray], with_bounds: bool = True) -> None:
+    offsets = [(0, i * 200) for i in range(len(tiles))]
+    config = ElementDetectionConfig()
+    
+    batch = ElementDetector(config, ocr).detect_batch(tiles, offsets)
+    single = ElementDetector(config, ocr)
+    expected = [e for t, o in zip(tiles, offsets) for e in single.detect(t, o).elements]
+    
+    assert expected
+    assert _words(batch.elements, with_bounds) == _words(expected, with_bounds)
+
+
+def test_detect_batch_matches_detect_on_dark_tiles():
+    tiles = [_tile("Save changes", dark=True), _tile("Cancel", dark=True)]
+    _batch_matches_single(_ThresholdOCR(), tiles)
+
+
+def test_detect_batch_matches_detect_on_mixed_themes():
+    tiles = [
+        _tile("Save changes", dark=True),
+        _tile("Cancel", dark=False),
+        _tile("Open file", dark=True),
+    ]
+    _batch_matches_single(_ThresholdOCR(), tiles)
+
+
+def test_detect_batch_matches_detect_with_tesseract():
+    ocr = OCREngine(OCRConfig(tesseract_path=None, language="eng"))
+    if not ocr.is_available:
+        pytest.skip("Tesseract is not installed")
+    tiles = [_tile("Save changes", dark=True), _tile("Cancel", dark=False)]
+    # Word boxes can shift by a pixel between contexts; the text must not
+    _batch_matches_single(ocr, tiles, with_bounds=False)
+
+
+def _filter_pairwise(elements: list[UIElement], threshold: float = 0.5) -> list[UIElement]:
+    """Reference: the original filter, checking every kept element."""
+    elements = sorted(elements, key=lambda e: e.confidence, reverse=True)
+    kept: list[UIElement] = []
+    for elem in elements:
+        for existing in kept:
+            inter = elem.bounds.intersection(existing.bounds)
+            min_area = min(elem.bounds.area, existing.bounds.area)
+            if inter is not None and min_area > 0 and inter.area / min_area > threshold:
+                break
+        else:
+            kept.append(elem)
+    return kept
+
+
+def _random_box(rng: random.Random) -> BoundingBox:
+    cell = _NMS_CELL
+    kind = rng.random()
+    if kind < 0.3:
+        # Edges exactly on (or one pixel off) grid lines
+        x = rng.randrange(0, 12) * cell + rng.choice([-1, 0, 0, 1])
+        y = rng.randrange(0, 8) * cell + rng.choice([-1, 0, 0, 1])
+        w = rng.randrange(1, 4) * cell + rng.choice([-1, 0, 0, 1])
+        h = rng.randrange(1, 3) * cell + rng.choice([-1, 0, 0, 1])
+    elif kind < 0.5:
+        # Larger than a cell, spanning several
+        x, y = rng.randrange(-50, 700), rng.randrange(-50, 450)
+        w, h = rng.randrange(cell, 5 * cell), rng.randrange(cell, 3 * cell)
+    elif kind < 0.55:
+        # Degenerate
+        x, y = rng.randrange(0, 700), rng.randrange(0, 450)
+        w, h = rng.choice([(0, 10), (10, 0), (0, 0)])
+    else:
+        x, y = rng.randrange(0, 780), rng.randrange(0, 500)
+        w, h = rng.randrange(1, 60), rng.randrange(1, 30)
+    return BoundingBox(x, y, w, h)
+
+
+def test_grid_filter_matches_pairwise_filter():
+    rng = random.Random(3)
+    detector = ElementDetector(ElementDetectionConfig(), _ThresholdOCR())
+    
+    for _ in range(200):
+        boxes = [_random_box(rng) for _ in range(rng.randrange(2, 80))]
+        # Jittered near-duplicates, so suppression actually happens
+        for b in rng.sample(boxes, len(boxes) // 3):
+            dx, dy = rng.randrange(-8, 9), rng.randrange(-8, 9)
+            boxes.append(BoundingBox(b.x + dx, b.y + dy, b.width, b.height))
+        elements = [
+            UIElement(
+                id=f"e{i}",
+                type=ElementType.TEXT,
+                bounds=b,
+                # Coarse confidences, so ties keep their input order
+                confidence=rng.choice([0.5, 0.7, 0.9]),
+            )
+            for i, b in enumerate(boxes)
+        ]
+        
+        expected = [e.id for e in _filter_pairwise(elements)]
+        actual = [e.id for e in detector._filter_elements(list(elements))]
+        assert actual == expected
@@ -0,0 +1,167 @@
+"""Tests for the engine's change notification (subscribe / wait_for_change)."""
+
+import sys
+import threading
+import time
+
+import numpy as np
+import pytest
+
+if sys.platform != "win32":
+    pytest.skip("the engine imports Windows-only modules", allow_module_level=True)
+
+from mcp_desktop_visual import engine as engine_module
+from mcp_desktop_visual.capture import CapturedFrame, CaptureResult
+from mcp_desktop_visual.engine import DesktopVisualEngine
+from mcp_desktop_visual.models import BoundingBox, ElementType, UIElement
+
+
+class _FakeCapture:
+    """Stands in for ScreenCapture; every grab is a full capture."""
+    
+    def start(self) -> None:
+        pass
+    
+    def stop(self) -> None:
+        pass
+    
+    def reset(self) -> None:
+        pass
+    
+    def capture_incremental(self) -> CaptureResult:
+        frame = CapturedFrame(
+            bgra=np.zeros((4, 4, 4), np.uint8), timestamp=time.time(), monitor_info={}
+        )
+        return CaptureResult(frame=frame)
+
+
+class _QuietWindowEvents:
+    """Stands in for WindowEventWatcher; never reports a window change."""
+    
+    def start(self) -> bool:
+        return True
+    
+    def stop(self) -> None:
+        pass
+    
+    def consume(self) -> bool:
+        return False
+
+
+def _button(element_id: str, x: int) -> UIElement:
+    return UIElement(
+        id=element_id,
+        type=ElementType.BUTTON,
+        bounds=BoundingBox(x, 10, 40, 20),
+        label=element_id,
+    )
+
+
+@pytest.fixture
+def screen() -> list[UIElement]:
+    """Elements the stubbed detector finds on every frame."""
+    return []
+
+
+@pytest.fixture
+def analyzed_on() -> set[str]:
+    """Names of the threads that ran the stubbed detector."""
+    return set()
+
+
+@pytest.fixture
+def engine(monkeypatch, screen, analyzed_on):
+    monkeypatch.setattr(engine_module, "get_all_windows", lambda: [])
+    monkeypatch.setattr(engine_module, "get_screen_size", lambda: (800, 600))
+    
+    def detect(capture):
+        analyzed_on.add(threading.current_thread().name)
+        return list(screen)
+    
+    eng = DesktopVisualEngine()
+    eng._capture = _FakeCapture()
+    eng._window_events = _QuietWindowEvents()
+    eng._analyze_full_screen = detect
+    yield eng
+    eng.stop()
+
+
+def test_diffs_fan_out_to_subscribers_until_unsubscribed(engine, screen):
+    first = engine.subscribe()
+    second = engine.subscribe()
+    
+    screen.append(_button("ok", 10))
+    diff = engine.capture_and_analyze()
+    assert diff.has_changes
+    assert first.get_nowait() is diff
+    assert second.get_nowait() is diff
+    
+    # Frames without changes are not published
+    assert not engine.capture_and_analyze().has_changes
+    assert first.empty() and second.empty()
+    
+    engine.unsubscribe(second)
+    engine.unsubscribe(second)  # unknown queues are ignored
+    screen.append(_button("cancel", 100))
+    diff = engine.capture_and_analyze()
+    assert first.get_nowait() is diff
+    assert second.empty()
+
+
+def test_full_subscriber_queue_drops_newer_diffs(engine, screen):
+    q = engine.subscribe(maxsize=1)
+    
+    screen.append(_button("ok", 10))
+    kept = engine.capture_and_analyze()
+    screen.append(_button("cancel", 100))
+    engine.capture_and_analyze()
+    
+    assert q.qsize() == 1
+    assert q.get_nowait() is kept
+
+
+def test_monitor_hands_frames_to_analysis_thread(engine, screen, analyzed_on):
+    q = engine.subscribe()
+    screen.append(_button("ok", 10))
+    
+    engine.start_monitoring(interval=0.01, max_interval=0.05)
+    diff = q.get(timeout=5)
+    
+    assert diff.has_changes
+    assert analyzed_on == {"desktop-visual-analyze"}
+    assert engine.find_element_by_id("ok") is not None
+    
+    # While monitoring, callers' frames go through the same pipeline
+    screen.append(_button("cancel", 100))
+    engine.capture_and_analyze()
+    assert analyzed_on == {"desktop-visual-analyze"}
+    assert engine.find_element_by_id("cancel") is not None
+    
+    engine.stop_monitoring()
+    assert engine._analyze_thread is None
+
+
+def test_wait_for_change_wakes_on_published_diff(engine, screen):
+    q = engine.subscribe()
+    screen.append(_button("ok", 10))
+    engine.start_monitoring(interval=0.01, max_interval=0.05)
+    q.get(timeout=5)  # the first frame's diff
+    
+    timer = threading.Timer(0.2, screen.append, args=(_button("cancel", 100),))
+    timer.start()
+    start = time.monotonic()
+    try:
+        assert engine.wait_for_change(timeout=30)
+    finally:
+        timer.cancel()
+    
+    assert time.monotonic() - start < 10
+    assert engine.find_element_by_id("cancel") is not None
+    assert not engine._change_waiters
+
+
+def test_wait_for_change_times_out_on_idle_screen(engine):
+    engine.start_monitoring(interval=0.01, max_interval=0.05)
+    
+    assert not engine.wait_for_change(timeout=0.3)
+    assert not engine._change_waiters
@@ -0,0 +1,117 @@
+"""Tests for the quadtree spatial index."""
+
+import random
+
+from mcp_desktop_visual.models import BoundingBox
+from mcp_desktop_visual.spatial import QuadTree
+
+
+SCREEN = BoundingBox(0, 0, 800, 600)
+
+
+def _smallest_linear(items: dict[str, BoundingBox], x: int, y: int):
+    """Reference: first item (insertion order) with the smallest area."""
+    matching = [(b.area, i) for i, (item_id, b) in enumerate(items.items()) if b.contains(x, y)]
+    if not matching:
+        return None
+    return list(items)[min(matching)[1]]
+
+
+def test_insert_remove_and_query():
+    tree = QuadTree(SCREEN, max_items=2)
+    tree.insert("a", BoundingBox(10, 10, 50, 20))
+    tree.insert("b", BoundingBox(500, 400, 40, 40))
+    tree.insert("c", BoundingBox(20, 15, 10, 10))
+    
+    assert len(tree) == 3
+    assert tree.query_point_smallest(25, 20) == "c"
+    assert tree.query_point_smallest(12, 12) == "a"
+    assert tree.query_point_smallest(520, 420) == "b"
+    assert tree.query_point_smallest(300, 300) is None
+    
+    tree.remove("c")
+    tree.remove("missing")
+    assert len(tree) == 2
+    assert tree.query_point_smallest(25, 20) == "a"
+
+
+def test_items_straddling_split_lines_are_found():
+    tree = QuadTree(SCREEN, max_items=1, max_depth=4)
+    # Fill every quadrant so the root splits, then add boxes across the
+    # vertical and horizontal center lines and one outside the root
+    for i, (x, y) in enumerate([(10, 10), (700, 10), (10, 500), (700, 500)]):
+        tree.insert(f"q{i}", BoundingBox(x, y, 20, 20))
+    tree.insert("center", BoundingBox(390, 290, 20, 20))
+    tree.insert("vertical", BoundingBox(395, 100, 10, 10))
+    tree.insert("outside", BoundingBox(790, 590, 30, 30))
+    
+    assert tree.query_point_smallest(400, 300) == "center"
+    assert tree.query_point_smallest(400, 105) == "vertical"
+    assert tree.query_point_smallest(815, 615) == "outside"
+    assert tree.query_point_smallest(705, 505) == "q3"
+
+
+def test_equal_area_ties_go_to_first_inserted():
+    tree = QuadTree(SCREEN, max_items=1)
+    # "wide" straddles the center and stays in the root, "inner" sits in
+    # a quadrant, so the walk sees them in a different order than inserted
+    tree.insert("inner", BoundingBox(350, 250, 40, 40))
+    tree.insert("other", BoundingBox(600, 500, 10, 10))
+    tree.insert("wide", BoundingBox(370, 270, 40, 40))
+    
+    assert tree.query_point_smallest(380, 280) == "inner"
+    
+    # Re-inserting moves an item to the back of the order
+    tree.insert("inner", BoundingBox(350, 250, 40, 40))
+    assert tree.query_point_smallest(380, 280) == "wide"
+
+
+def test_matches_linear_scan():
+    rng = random.Random(7)
+    tree = QuadTree(SCREEN, max_items=2, max_depth=6)
+    items: dict[str, BoundingBox] = {}
+    
+    for n in range(400):
+        item_id = f"e{rng.randrange(300)}"
+        if item_id in items and rng.random() < 0.3:
+            tree.remove(item_id)
+            del items[item_id]
+            continue
+        # Coarse sizes so equal areas (ties) are common
+        b = BoundingBox(rng.randrange(0, 780), rng.randrange(0, 580),
+                        rng.choice([10, 20, 40, 80]), rng.choice([10, 20, 40]))
+        tree.insert(item_id, b)
+        items.pop(item_id, None)
+        items[item_id] = b
+    
+    for _ in range(500):
+        x, y = rng.randrange(0, 800), rng.randrange(0, 600)
+        assert tree.query_point_smallest(x, y) == _smallest_linear(items, x, y)
+
+
+def test_copies_do_not_see_each_others_edits():
+    rng = random.Random(11)
+    tree = QuadTree(SCREEN, max_items=2, max_depth=6)
+    items: dict[str, BoundingBox] = {}
+    for n in range(60):
+        b = BoundingBox(rng.randrange(0, 780), rng.randrange(0, 580), 20, 20)
+        tree.insert(f"e{n}", b)
+        items[f"e{n}"] = b
+    
+    copy = tree.copy()
+    copy_items = dict(items)
+    # Edit both sides after the copy, including removals and splits
+    for n in range(0, 60, 3):
+        copy.remove(f"e{n}")
+        del copy_items[f"e{n}"]
+    for n in range(60, 120):
+        b = BoundingBox(rng.randrange(0, 780), rng.randrange(0, 580), 10, 10)
+        tree.insert(f"e{n}", b)
+        items[f"e{n}"] = b
+    
+    assert len(tree) == len(items)
+    assert len(copy) == len(copy_items)
+    for _ in range(500):
+        x, y = rng.randrange(0, 800), rng.randrange(0, 600)
+        assert tree.query_point_smallest(x, y) == _smallest_linear(items, x, y)
+        assert copy.query_point_smallest(x, y) == _smallest_linear(copy_items, x, y)